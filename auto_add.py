@@ -8,60 +8,70 @@
     python auto_add.py --folder 문서명      # 특정 문서만 추가
     python auto_add.py 문서명               # 특정 문서만 추가 (위와 동일)
     python auto_add.py --source 경로        # 커스텀 소스 폴더 지정
+    python auto_add.py --workers 4          # 동시 처리 문서 수 지정 (기본: 8, 청킹/임베딩/저장은 한 문서씩)
 """
 
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from rag.pipeline import RAGPipeline
-import json
+import orjson
 import time
 import os
 
 # 처리 기록 파일
 PROCESSED_LOG = Path("data/.processed_documents.json")
 
+# 동시에 처리할 최대 문서 수 (파일 읽기, LLM 요약 대기 시간 활용)
+# 파이프라인의 청킹/임베딩/저장 단계는 스레드 안전하지 않으므로 INDEX_LOCK으로 한 문서씩 실행
+MAX_WORKERS = 8
+INDEX_LOCK = threading.Lock()
+
 def load_processed_log():
-    """이미 처리한 문서 목록 로드"""
+    """이미 처리한 문서 목록 로드 (processed는 빠른 조회를 위해 set으로 반환)"""
     if PROCESSED_LOG.exists():
-        with open(PROCESSED_LOG, 'r', encoding='utf-8', errors='replace') as f:
-            return json.load(f)
-    return {"processed": [], "last_update": None}
+        log = orjson.loads(PROCESSED_LOG.read_bytes())
+        log["processed"] = set(log.get("processed", []))
+        return log
+    return {"processed": set(), "last_update": None}
 
 def save_processed_log(log):
     """처리한 문서 목록 저장"""
     log["last_update"] = time.strftime("%Y-%m-%d %H:%M:%S")
     PROCESSED_LOG.parent.mkdir(parents=True, exist_ok=True)
-    with open(PROCESSED_LOG, 'w', encoding='utf-8') as f:
-        json.dump(log, f, ensure_ascii=False, indent=2)
+    PROCESSED_LOG.write_bytes(orjson.dumps(
+        {"processed": sorted(log["processed"]), "last_update": log["last_update"]},
+        option=orjson.OPT_INDENT_2
+    ))
 
 def get_extracted_folders(base_dir):
     """추출된 문서 폴더 목록 가져오기"""
-    base_path = Path(base_dir)
-    if not base_path.exists():
+    if not os.path.isdir(base_dir):
         return []
     
-    folders = []
-    for item in base_path.iterdir():
-        if item.is_dir() and item.name.startswith("extracted_"):
-            folders.append(item)
-    
-    return sorted(folders)
+    # DirEntry.is_dir()는 readdir 결과의 파일 타입을 사용하므로 항목마다 stat 호출이 없음
+    with os.scandir(base_dir) as entries:
+        return sorted(
+            (Path(entry.path) for entry in entries
+             if entry.name.startswith("extracted_") and entry.is_dir()),
+            key=lambda path: path.name
+        )
 
 def add_document_to_rag(pipeline, folder_path):
-    """문서를 RAG 시스템에 추가"""
+    """
+    문서를 RAG 시스템에 추가 (워커 스레드에서 실행)
+    
+    진행 출력이 문서끼리 섞이지 않도록 출력은 호출한 메인 스레드에서 처리
+    
+    Returns:
+        (성공 여부, 추가 결과 또는 예외)
+    """
     try:
-        doc_name = folder_path.name.replace("extracted_", "")
-        print(f"\n처리 중: {doc_name}")
-        print("-" * 60)
-        
-        result = pipeline.add_document_from_extract(folder_path)
-        
-        print(f"✓ 추가 완료: {result['chunks_added']}개 청크")
+        result = pipeline.add_document_from_extract(folder_path, index_lock=INDEX_LOCK)
         return True, result
-        
     except Exception as e:
-        print(f"✗ 오류 발생: {e}")
-        return False, None
+        return False, e
 
 def main():
     parser = argparse.ArgumentParser(description="추출된 문서를 RAG 시스템에 자동 추가")
@@ -72,6 +82,8 @@ def main():
     parser.add_argument("--folder", type=str, help="특정 폴더만 추가")
     parser.add_argument("--source", type=str, default="extracted_results", 
                        help="문서가 있는 폴더 경로 (기본: extracted_results)")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS,
+                       help=f"동시 처리 문서 수 (기본: {MAX_WORKERS})")
     args = parser.parse_args()
     
     # 호환성 처리: positional argument 'all' → args.all으로 변환
@@ -122,7 +134,7 @@ def main():
     elif args.all:
         # 모든 문서
         folders_to_process = folders
-        log["processed"] = []  # 기록 초기화
+        log["processed"] = set()  # 기록 초기화
     else:
         # 새 문서만
         folders_to_process = [f for f in folders if str(f) not in log["processed"]]
@@ -149,16 +161,26 @@ def main():
     fail_count = 0
     total_chunks = 0
     
-    for i, folder in enumerate(folders_to_process, 1):
-        print(f"\n[{i}/{len(folders_to_process)}]")
-        success, result = add_document_to_rag(pipeline, folder)
-        
-        if success:
-            success_count += 1
-            total_chunks += result['chunks_added']
-            log["processed"].append(str(folder))
-        else:
-            fail_count += 1
+    max_workers = max(1, min(args.workers, len(folders_to_process)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(add_document_to_rag, pipeline, folder): folder
+            for folder in folders_to_process
+        }
+        for i, future in enumerate(as_completed(futures), 1):
+            folder = futures[future]
+            success, result = future.result()
+            print(f"\n[{i}/{len(folders_to_process)}] {folder.name.replace('extracted_', '')}")
+            print("-" * 60)
+            
+            if success:
+                print(f"✓ 추가 완료: {result['chunks_added']}개 청크")
+                success_count += 1
+                total_chunks += result['chunks_added']
+                log["processed"].add(str(folder))
+            else:
+                print(f"✗ 오류 발생: {result}")
+                fail_count += 1
     
     # 처리 기록 저장
     save_processed_log(log)
@@ -3,26 +3,34 @@ FastAPI 메인 애플리케이션
 비동기 RAG 시스템 API
 """
 
+import asyncio
 import logging
 import time
 from typing import Optional
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, BackgroundTasks, WebSocket, WebSocketDisconnect
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 
+import orjson
+import redis.asyncio as aioredis
+from cachetools import TTLCache
 from celery.result import AsyncResult
 from models import (
     DocumentMetadata, AsyncUploadResponse, TaskStatusResponse,
     QueryRequest, QueryResponse, DocumentListResponse, DocumentDeleteResponse,
     DocumentInfo, HealthResponse, ErrorResponse
 )
-from dependencies import get_rag_pipeline, get_project_root
-from celery_config import celery_app
+from dependencies import get_rag_pipeline, get_vector_store_count, get_project_root
+from rag.pipeline import RAGPipeline
+from celery_config import celery_app, RESULT_BACKEND, TASK_CHANNEL_PREFIX
 from tasks import process_document
 import utils
-import logging as logging_module
+
+# 업로드마다 재사용하는 문서 처리 Task 시그니처 (clone 후 위치 인자로 호출)
+_PROCESS_DOCUMENT_SIG = process_document.s()
 
 # 로깅 설정
 logging.basicConfig(
@@ -31,11 +39,56 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Redis 채널로 수신한 작업별 최신 상태와 수신 시각 (Celery result_expires와 동일하게 1시간 보관)
+_task_states: TTLCache = TTLCache(maxsize=10000, ttl=3600)
+
+# 종료 상태
+TERMINAL_STATUSES = ("completed", "failed")
+
+# 진행 중 상태를 캐시에서 그대로 쓰는 최대 경과 시간 (초과 시 Celery 결과 백엔드 조회)
+# pub/sub은 최대 1회 전달이므로 종료 상태 발행이 유실되어도 이 시간 뒤에는 실제 상태를 반환
+TASK_STATE_MAX_AGE = 5
+
+# 상태 구독 재연결 대기 시간 (초, 실패할 때마다 2배로 늘려 최대값까지)
+TASK_LISTENER_BACKOFF = 1
+TASK_LISTENER_MAX_BACKOFF = 30
+
+# WebSocket 최대 대기 시간 (Celery task_time_limit와 동일)
+TASK_WS_MAX_WAIT = 600
+
 
 # ========================================
 # 라이프사이클 이벤트
 # ========================================
 
+async def listen_task_events(redis_client):
+    """
+    워커가 발행하는 작업 상태(task:*)를 구독하여 _task_states에 캐시
+    연결이 끊기면 캐시를 비우고(끊긴 동안의 상태는 Celery 결과 조회로 대체) 백오프 후 재구독
+    """
+    backoff = TASK_LISTENER_BACKOFF
+    while True:
+        pubsub = redis_client.pubsub()
+        try:
+            await pubsub.psubscribe(f"{TASK_CHANNEL_PREFIX}*")
+            backoff = TASK_LISTENER_BACKOFF
+            async for message in pubsub.listen():
+                if message["type"] != "pmessage":
+                    continue
+                task_id = message["channel"].decode()[len(TASK_CHANNEL_PREFIX):]
+                _task_states[task_id] = (time.monotonic(), orjson.loads(message["data"]))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("작업 상태 구독 중단 (%s초 후 재연결, 그동안 Celery 결과 조회로 대체): %s", backoff, e)
+        finally:
+            _task_states.clear()
+            await pubsub.reset()
+        
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, TASK_LISTENER_MAX_BACKOFF)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -47,11 +100,16 @@ async def lifespan(app: FastAPI):
         rag = get_rag_pipeline()
         logger.info("RAG 시스템 초기화 완료")
     except Exception as e:
-        logger.error(f"RAG 시스템 초기화 실패: {e}")
+        logger.error("RAG 시스템 초기화 실패: %s", e)
+    
+    app.state.redis = aioredis.from_url(RESULT_BACKEND)
+    listener = asyncio.create_task(listen_task_events(app.state.redis))
     
     yield
     
     # 종료 시
+    listener.cancel()
+    await app.state.redis.close()
     logger.info("FastAPI 애플리케이션 종료")
 
 
@@ -63,15 +121,60 @@ app = FastAPI(
     title="RAG System API",
     description="HWP/HWPX 문서 기반 질의응답 시스템",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# CORS 설정
+UPLOAD_PATH = "/api/documents/upload/async"
+UPLOAD_FORM_OVERHEAD = 64 * 1024  # multipart 경계/헤더 및 폼 필드 여유분
+_UPLOAD_TOO_LARGE_BODY = orjson.dumps({
+    "status": "failed",
+    "error": {
+        "code": "HTTP_413",
+        "message": f"파일 크기가 {utils.MAX_UPLOAD_SIZE_MB}MB를 초과합니다."
+    }
+})
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Content-Length가 업로드 한도를 넘는 업로드 요청을 본문을 읽기 전에 413으로 거절
+    
+    UploadFile은 핸들러 실행 전에 본문 전체가 임시 파일로 수신되므로, 헤더 단계에서 막아야
+    대용량 업로드의 수신/디스크 기록을 피할 수 있음 (Content-Length가 없으면 저장 중에 검사)
+    """
+    
+    def __init__(self, app, max_body_size: int):
+        self.app = app
+        self.max_body_size = max_body_size
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == UPLOAD_PATH:
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    if value.isdigit() and int(value) > self.max_body_size:
+                        await send({
+                            "type": "http.response.start",
+                            "status": 413,
+                            "headers": [(b"content-type", b"application/json"), (b"connection", b"close")]
+                        })
+                        await send({"type": "http.response.body", "body": _UPLOAD_TOO_LARGE_BODY})
+                        return
+                    break
+        await self.app(scope, receive, send)
+
+
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_body_size=utils.MAX_UPLOAD_SIZE_BYTES + UPLOAD_FORM_OVERHEAD
+)
+
+# CORS 설정 (사용하는 메서드만 명시)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=("GET", "POST", "DELETE"),
     allow_headers=["*"],
 )
 
@@ -89,17 +192,17 @@ async def health_check():
         rag = get_rag_pipeline()
         rag_status = "ok"
     except Exception as e:
-        logger.error(f"RAG 시스템 상태 확인 실패: {e}")
+        logger.error("RAG 시스템 상태 확인 실패: %s", e)
         rag_status = "error"
     
     # 벡터 저장소 상태 확인
-    try:
-        rag = get_rag_pipeline()
-        vector_store_count = rag.vector_store.collection.count()
-        vector_store_status = "ok" if vector_store_count >= 0 else "error"
-    except Exception as e:
-        logger.error(f"벡터 저장소 상태 확인 실패: {e}")
-        vector_store_status = "error"
+    vector_store_status = "error"
+    if rag_status == "ok":
+        try:
+            vector_store_count = get_vector_store_count(rag)
+            vector_store_status = "ok" if vector_store_count >= 0 else "error"
+        except Exception as e:
+            logger.error("벡터 저장소 상태 확인 실패: %s", e)
     
     return HealthResponse(
         status="ok" if rag_status == "ok" and vector_store_status == "ok" else "error",
@@ -112,7 +215,7 @@ async def health_check():
 # 문서 업로드 API (비동기)
 # ========================================
 
-@app.post("/api/documents/upload/async", response_model=AsyncUploadResponse)
+@app.post(UPLOAD_PATH, response_model=AsyncUploadResponse)
 async def upload_document_async(
     file: UploadFile = File(..., description="HWP/HWPX 파일"),
     user_id: str = None,
@@ -135,21 +238,30 @@ async def upload_document_async(
         비동기 업로드 응답 (task_id 포함)
     """
     request_id = utils.generate_request_id()
-    logger.info(f"[{request_id}] 비동기 문서 업로드 시작: {file.filename}")
+    logger.info("[%s] 비동기 문서 업로드 시작: %s", request_id, file.filename)
     
     try:
-        # 1. 파일 검증
-        content = await file.read()
-        is_valid, validation_msg = utils.validate_file(file.filename, len(content))
+        # 1. 파일 형식 검증 (크기는 저장하면서 확인)
+        is_valid, validation_msg = utils.validate_file(file.filename)
         
         if not is_valid:
-            logger.warning(f"[{request_id}] 파일 검증 실패: {validation_msg}")
+            logger.warning("[%s] 파일 검증 실패: %s", request_id, validation_msg)
             raise HTTPException(status_code=400, detail=validation_msg)
         
-        # 2. 파일 저장
+        # 2. 파일 저장 (청크 단위 스트리밍, 한도를 넘는 순간 중단)
         upload_path = utils.generate_upload_path(dept_id, file.filename)
-        saved_path = await utils.save_upload_file(content, upload_path)
-        logger.info(f"[{request_id}] 파일 저장 완료: {saved_path}")
+        try:
+            saved_path, file_size, file_hash = await utils.save_upload_file(file, upload_path)
+        except ValueError as ve:
+            logger.warning("[%s] 파일 검증 실패: %s", request_id, ve)
+            raise HTTPException(status_code=413, detail=str(ve))
+        
+        is_valid, validation_msg = utils.validate_file(file.filename, file_size)
+        if not is_valid:
+            saved_path.unlink(missing_ok=True)
+            logger.warning("[%s] 파일 검증 실패: %s", request_id, validation_msg)
+            raise HTTPException(status_code=400, detail=validation_msg)
+        logger.info("[%s] 파일 저장 완료: %s", request_id, saved_path)
         
         # 3. 사용자 메타데이터 구성
         user_metadata = utils.build_user_metadata(
@@ -160,11 +272,10 @@ async def upload_document_async(
         )
         
         # 4. 비동기 작업 등록 (Celery Task)
-        task = process_document.delay(
-            file_path=str(saved_path),
-            user_metadata=user_metadata
-        )
-        logger.info(f"[{request_id}] Celery Task 등록: {task.id}")
+        task = _PROCESS_DOCUMENT_SIG.clone(
+            args=(str(saved_path), user_metadata, file_hash)
+        ).apply_async()
+        logger.info("[%s] Celery Task 등록: %s", request_id, task.id)
         
         return AsyncUploadResponse(
             status="processing",
@@ -174,10 +285,10 @@ async def upload_document_async(
         )
         
     except HTTPException as he:
-        logger.error(f"[{request_id}] HTTP 예외: {he.detail}")
+        logger.error("[%s] HTTP 예외: %s", request_id, he.detail)
         raise
     except Exception as e:
-        logger.error(f"[{request_id}] 문서 업로드 실패: {e}")
+        logger.error("[%s] 문서 업로드 실패: %s", request_id, e)
         raise HTTPException(
             status_code=500,
             detail=f"문서 업로드 중 오류가 발생했습니다: {str(e)}"
@@ -188,75 +299,139 @@ async def upload_document_async(
 # 작업 상태 조회 API
 # ========================================
 
+def build_task_status(task_id: str) -> TaskStatusResponse:
+    """
+    작업 상태 구성
+    구독으로 받은 상태가 종료 상태이거나 TASK_STATE_MAX_AGE 이내에 받은 것이면 사용하고,
+    그 외에는 Celery 결과 백엔드 조회
+    """
+    cached = _task_states.get(task_id)
+    if cached is not None:
+        received_at, cached_state = cached
+        if (cached_state['status'] in TERMINAL_STATUSES
+                or time.monotonic() - received_at < TASK_STATE_MAX_AGE):
+            return TaskStatusResponse(task_id=task_id, **cached_state)
+    
+    task = AsyncResult(task_id, app=celery_app)
+    
+    if task.state == 'PENDING':
+        return TaskStatusResponse(
+            task_id=task_id,
+            status="pending",
+            progress=0,
+            message="작업 대기 중입니다."
+        )
+    
+    elif task.state == 'PROGRESS':
+        meta = task.info
+        return TaskStatusResponse(
+            task_id=task_id,
+            status="processing",
+            progress=meta.get('progress', 0),
+            stage=meta.get('stage', ''),
+            message=meta.get('message', '처리 중입니다.')
+        )
+    
+    elif task.state == 'SUCCESS':
+        result = task.result
+        return TaskStatusResponse(
+            task_id=task_id,
+            status="completed",
+            progress=100,
+            stage="완료",
+            message="문서 처리가 완료되었습니다.",
+            result=result
+        )
+    
+    else:  # FAILURE, REVOKED 등
+        error_info = task.info
+        return TaskStatusResponse(
+            task_id=task_id,
+            status="failed",
+            progress=0,
+            message="작업 처리 중 오류가 발생했습니다.",
+            error=str(error_info) if error_info else "Unknown error"
+        )
+
+
 @app.get("/api/tasks/{task_id}", response_model=TaskStatusResponse)
 async def get_task_status(task_id: str):
  
-    logger.info(f"작업 상태 조회: {task_id}")
+    logger.info("작업 상태 조회: %s", task_id)
     
     try:
-        task = AsyncResult(task_id, app=celery_app)
-        
-        if task.state == 'PENDING':
-            return TaskStatusResponse(
-                task_id=task_id,
-                status="pending",
-                progress=0,
-                message="작업 대기 중입니다."
-            )
+        return build_task_status(task_id)
+    except Exception as e:
+        logger.error("작업 상태 조회 실패 (%s): %s", task_id, e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.websocket("/api/tasks/{task_id}/ws")
+async def task_status_ws(websocket: WebSocket, task_id: str):
+    """
+    작업 상태 스트리밍
+    현재 상태를 먼저 보내고, 이후 워커가 발행하는 상태를 완료/실패까지 전달
+    """
+    await websocket.accept()
+    
+    # 이미 끝난 작업은 구독 없이 결과만 전달
+    status = await run_in_threadpool(build_task_status, task_id)
+    if status.status in TERMINAL_STATUSES:
+        await websocket.send_json(status.model_dump())
+        await websocket.close()
+        return
+    
+    pubsub = app.state.redis.pubsub()
+    try:
+        await pubsub.subscribe(f"{TASK_CHANNEL_PREFIX}{task_id}")
         
-        elif task.state == 'PROGRESS':
-            meta = task.info
-            return TaskStatusResponse(
-                task_id=task_id,
-                status="processing",
-                progress=meta.get('progress', 0),
-                stage=meta.get('stage', ''),
-                message=meta.get('message', '처리 중입니다.')
-            )
+        # 구독 이전에 바뀐 상태 반영
+        status = await run_in_threadpool(build_task_status, task_id)
+        await websocket.send_json(status.model_dump())
         
-        elif task.state == 'SUCCESS':
-            result = task.result
-            return TaskStatusResponse(
-                task_id=task_id,
-                status="completed",
-                progress=100,
-                stage="완료",
-                message="문서 처리가 완료되었습니다.",
-                result=result
-            )
+        deadline = time.monotonic() + TASK_WS_MAX_WAIT
+        last_update = time.monotonic()
+        while status.status not in TERMINAL_STATUSES and time.monotonic() < deadline:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            if message is not None:
+                status = TaskStatusResponse(task_id=task_id, **orjson.loads(message["data"]))
+            elif time.monotonic() - last_update >= TASK_STATE_MAX_AGE:
+                # 발행이 유실되었을 수 있으므로 Celery 결과 백엔드로 확인
+                checked = await run_in_threadpool(build_task_status, task_id)
+                last_update = time.monotonic()
+                if checked == status:
+                    continue
+                status = checked
+            else:
+                continue
+            last_update = time.monotonic()
+            await websocket.send_json(status.model_dump())
         
-        else:  # FAILURE, REVOKED 등
-            error_info = task.info
-            return TaskStatusResponse(
-                task_id=task_id,
-                status="failed",
-                progress=0,
-                message="작업 처리 중 오류가 발생했습니다.",
-                error=str(error_info) if error_info else "Unknown error"
-            )
-            
-    except Exception as e:
-        logger.error(f"작업 상태 조회 실패 ({task_id}): {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.info("작업 상태 WebSocket 연결 종료: %s", task_id)
+    finally:
+        await pubsub.reset()
 
 
 # ========================================
 # 질의응답 API (동기)
 # ========================================
 
-@app.post("/api/query", response_model=QueryResponse)
-async def query(request: QueryRequest):
+@app.post("/api/query", response_model=None, responses={200: {"model": QueryResponse}})
+async def query(request: QueryRequest, rag: RAGPipeline = Depends(get_rag_pipeline)):
     """
     질의응답 처리
     
     Args:
         request: 질의 요청
+        rag: RAG 파이프라인 인스턴스
         
     Returns:
         답변 및 출처 정보
     """
     request_id = utils.generate_request_id()
-    logger.info(f"[{request_id}] 질의응답 시작: {request.question}")
+    logger.info("[%s] 질의응답 시작: %s", request_id, request.question)
     
     start_time = time.time()
     
@@ -267,38 +442,40 @@ async def query(request: QueryRequest):
             project_id=request.project_id,
             category=request.category
         )
-        logger.info(f"[{request_id}] 필터: {filters}")
+        logger.info("[%s] 필터: %s", request_id, filters)
         
-        # 2. RAG 시스템에 질의
-        rag = get_rag_pipeline()
-        result = rag.query(
+        # 2. RAG 시스템에 질의 (스레드풀에서 실행해 동시 요청이 임베딩/재정렬 배치를 공유)
+        result = await run_in_threadpool(
+            rag.query,
             question=request.question,
             filters=filters,
             top_k=request.top_k
         )
         
         processing_time = time.time() - start_time
-        logger.info(f"[{request_id}] 질의응답 완료 ({processing_time:.2f}초)")
+        logger.info("[%s] 질의응답 완료 (%.2f초)", request_id, processing_time)
         
         # 3. 응답 포맷팅
         sources = utils.format_answer_sources(result.get('sources', []))
         tables = utils.format_table_data(result.get('tables', []))
         
-        return QueryResponse(
-            answer=result.get('answer', '답변을 생성할 수 없습니다.'),
-            sources=sources,
-            tables=tables,
-            processing_time=processing_time,
-            metadata={
+        # QueryResponse 형식의 dict를 바로 직렬화 (response_model=None이므로 응답 모델 검증/변환 생략,
+        # 스키마 문서는 responses로 유지)
+        return ORJSONResponse(content={
+            "answer": result.get('answer', '답변을 생성할 수 없습니다.'),
+            "sources": sources,
+            "tables": tables,
+            "processing_time": processing_time,
+            "metadata": {
                 "question": request.question,
                 "filters": filters,
                 "source_count": len(sources),
                 "table_count": len(tables)
             }
-        )
+        })
         
     except Exception as e:
-        logger.error(f"[{request_id}] 질의응답 실패: {e}")
+        logger.error("[%s] 질의응답 실패: %s", request_id, e)
         raise HTTPException(
             status_code=500,
             detail=f"질의응답 처리 중 오류가 발생했습니다: {str(e)}"
@@ -313,7 +490,8 @@ async def query(request: QueryRequest):
 async def list_documents(
     dept_id: Optional[str] = None,
     project_id: Optional[str] = None,
-    category: Optional[str] = None
+    category: Optional[str] = None,
+    rag: RAGPipeline = Depends(get_rag_pipeline)
 ):
     """
     문서 목록 조회
@@ -322,6 +500,7 @@ async def list_documents(
         dept_id: 부서 필터
         project_id: 프로젝트 필터
         category: 카테고리 필터
+        rag: RAG 파이프라인 인스턴스
         
     Returns:
         문서 목록
@@ -329,8 +508,6 @@ async def list_documents(
     logger.info("문서 목록 조회")
     
     try:
-        rag = get_rag_pipeline()
-        
         # 필터 구성
         filters = utils.build_query_filters(
             dept_id=dept_id,
@@ -352,7 +529,7 @@ async def list_documents(
         )
         
     except Exception as e:
-        logger.error(f"문서 목록 조회 실패: {e}")
+        logger.error("문서 목록 조회 실패: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -363,7 +540,7 @@ async def list_documents(
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """HTTP 예외 처리"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "status": "failed",
@@ -378,8 +555,8 @@ async def http_exception_handler(request, exc):
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     """일반 예외 처리"""
-    logger.error(f"예상치 못한 오류: {exc}")
-    return JSONResponse(
+    logger.error("예상치 못한 오류: %s", exc)
+    return ORJSONResponse(
         status_code=500,
         content={
             "status": "failed",
@@ -395,39 +572,47 @@ async def general_exception_handler(request, exc):
 # 루트 엔드포인트
 # ========================================
 
+# 고정 응답은 import 시 한 번만 직렬화
+_ROOT_BYTES = orjson.dumps({
+    "message": "RAG System API",
+    "version": "1.0.0",
+    "endpoints": {
+        "health": "/api/health",
+        "upload_async": "/api/documents/upload/async",
+        "task_status": "/api/tasks/{task_id}",
+        "query": "/api/query",
+        "docs": "/docs"
+    }
+})
+_DOCS_BYTES = orjson.dumps({
+    "message": "Swagger UI로 이동",
+    "url": "/docs"
+})
+
+
 @app.get("/")
 async def root():
     """루트 엔드포인트"""
-    return {
-        "message": "RAG System API",
-        "version": "1.0.0",
-        "endpoints": {
-            "health": "/api/health",
-            "upload_async": "/api/documents/upload/async",
-            "task_status": "/api/tasks/{task_id}",
-            "query": "/api/query",
-            "docs": "/docs"
-        }
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
 
 @app.get("/docs")
 async def get_docs():
     """API 문서"""
-    return {
-        "message": "Swagger UI로 이동",
-        "url": "/docs"
-    }
+    return Response(content=_DOCS_BYTES, media_type="application/json")
 
 
 if __name__ == "__main__":
     import uvicorn
+    from run_api import LOOP, WORKERS, RELOAD
     
     uvicorn.run(
         "api:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=RELOAD,
+        workers=None if RELOAD else WORKERS,
+        loop=LOOP,
+        http="httptools",
         log_level="info"
     )
-
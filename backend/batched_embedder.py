@@ -0,0 +1,208 @@
+"""
+동적 배칭
+여러 요청(Celery Task, API 요청)의 임베딩/재정렬 호출을 모아 한 번의 forward pass로 처리
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List, Tuple
+
+import numpy as np
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# 배치 설정
+MAX_BATCH = 64  # 한 번에 처리할 최대 입력 수
+MAX_WAIT_MS = 10  # 배치를 모으기 위해 기다리는 최대 시간 (ms)
+MIN_GPU_BATCH_SIZE = 16  # 이보다 작으면 합치지 않고 요청별로 처리 (패딩 오버헤드 방지)
+
+
+class DynamicBatcher:
+    """
+    입력 리스트 요청을 큐에 모아 max_wait_ms 또는 max_batch 단위로 한 번에 처리하는 워커 스레드
+
+    fn은 입력 리스트를 받아 입력과 같은 길이의 배열을 반환해야 하며,
+    결과는 요청별로 잘라 각 Future에 전달
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[List[Any]], np.ndarray],
+        name: str,
+        max_batch: int = MAX_BATCH,
+        max_wait_ms: int = MAX_WAIT_MS,
+        min_batch: int = MIN_GPU_BATCH_SIZE
+    ):
+        """
+        Args:
+            fn: 배치 처리 함수
+            name: 워커 스레드 이름
+            max_batch: 최대 배치 크기
+            max_wait_ms: 배치 대기 시간 (ms)
+            min_batch: 요청 병합 최소 크기
+        """
+        self.fn = fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.min_batch = min_batch
+        self._queue: "queue.Queue[Tuple[List[Any], Future]]" = queue.Queue()
+        self._consumer = threading.Thread(target=self._run, name=name, daemon=True)
+        self._consumer.start()
+
+    def submit(self, items: List[Any]) -> Future:
+        """입력 리스트를 큐에 넣고 결과 Future 반환"""
+        future = Future()
+        self._queue.put((items, future))
+        return future
+
+    def _run(self):
+        """큐를 비우며 max_wait_ms 또는 max_batch 단위로 처리"""
+        while True:
+            pending = [self._queue.get()]
+            count = len(pending[0][0])
+            deadline = time.monotonic() + self.max_wait
+
+            while count < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                pending.append(item)
+                count += len(item[0])
+
+            if count < self.min_batch:
+                for item in pending:
+                    self._process([item])
+            else:
+                self._process(pending)
+
+    def _process(self, pending: List[Tuple[List[Any], Future]]):
+        """요청들을 합쳐 한 번 처리 후 요청별로 잘라 Future에 전달"""
+        items = [item for request_items, _ in pending for item in request_items]
+        try:
+            results = self.fn(items)
+        except Exception as e:
+            for _, future in pending:
+                future.set_exception(e)
+            return
+
+        start = 0
+        for request_items, future in pending:
+            end = start + len(request_items)
+            future.set_result(results[start:end])
+            start = end
+
+
+class BatchedSentenceTransformer:
+    """
+    SentenceTransformer.encode를 DynamicBatcher로 처리하는 프록시
+
+    DocumentEmbedder.model 자리에 넣어 사용하며, encode 외의 속성은 원본 모델로 위임
+    """
+
+    def __init__(self, model, parallel_runs: int = 1, sub_batch_size: int = config.ONNX_SUB_BATCH_SIZE):
+        """
+        Args:
+            model: SentenceTransformer 인스턴스
+            parallel_runs: 서브 배치 동시 실행 수 (CUDA ONNX 세션은 intra_op 스레드 1개로 동작)
+            sub_batch_size: 동시 실행 시 서브 배치 크기
+        """
+        self.model = model
+        self.sub_batch_size = sub_batch_size
+        self._run_pool = (
+            ThreadPoolExecutor(max_workers=parallel_runs, thread_name_prefix="onnx-run")
+            if parallel_runs > 1 else None
+        )
+        self._batcher = DynamicBatcher(self._encode_batch, name="embedding-batcher")
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    def encode(self, sentences, batch_size: int = 32, show_progress_bar: bool = None,
+               convert_to_numpy: bool = True, **kwargs):
+        """SentenceTransformer.encode와 동일한 인터페이스 (numpy 출력만 배칭)"""
+        if kwargs or not convert_to_numpy:
+            return self.model.encode(
+                sentences,
+                batch_size=batch_size,
+                show_progress_bar=show_progress_bar,
+                convert_to_numpy=convert_to_numpy,
+                **kwargs
+            )
+        if isinstance(sentences, str):
+            return self._batcher.submit([sentences]).result()[0]
+        return self._batcher.submit(list(sentences)).result()
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        """병합된 텍스트 encode (ONNX 사용 시 서브 배치를 동시에 실행)"""
+        size = self.sub_batch_size
+        if self._run_pool is not None and len(texts) > size:
+            parts = self._run_pool.map(self._encode_texts, [texts[i:i + size] for i in range(0, len(texts), size)])
+            return np.concatenate(list(parts))
+        return self._encode_texts(texts)
+
+    def _encode_texts(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(
+            texts,
+            batch_size=self._batcher.max_batch,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+
+
+class BatchedCrossEncoder:
+    """
+    CrossEncoder.predict를 DynamicBatcher로 처리하는 프록시
+
+    DocumentReranker.model 자리에 넣어 사용하며, predict 외의 속성은 원본 모델로 위임
+    """
+
+    def __init__(self, model):
+        """
+        Args:
+            model: CrossEncoder 인스턴스
+        """
+        self.model = model
+        self._batcher = DynamicBatcher(self._predict_batch, name="rerank-batcher")
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    def predict(self, sentences, **kwargs):
+        """CrossEncoder.predict와 동일한 인터페이스 (기본 옵션 호출만 배칭)"""
+        if kwargs:
+            return self.model.predict(sentences, **kwargs)
+        return self._batcher.submit(list(sentences)).result()
+
+    def _predict_batch(self, pairs: List[List[str]]) -> np.ndarray:
+        return np.asarray(self.model.predict(
+            pairs,
+            batch_size=self._batcher.max_batch,
+            show_progress_bar=False
+        ))
+
+
+def enable_dynamic_batching(rag):
+    """
+    RAG 파이프라인의 임베딩 모델과 Reranker 모델을 동적 배칭 프록시로 교체
+
+    Args:
+        rag: RAGPipeline 인스턴스
+    """
+    embedder = rag.embedder
+    # CPU 세션은 Run 하나가 intra_op 스레드를 모두 쓰므로 서브 배치 동시 실행은 CUDA에서만
+    parallel_runs = config.ONNX_RUN_WORKERS if embedder.backend == "onnx" and embedder.device == "cuda" else 1
+    embedder.model = BatchedSentenceTransformer(embedder.model, parallel_runs=parallel_runs)
+    logger.info(f"임베딩 동적 배칭 활성화 (max_batch={MAX_BATCH}, max_wait={MAX_WAIT_MS}ms)")
+
+    if rag.reranker is not None:
+        rag.reranker.model = BatchedCrossEncoder(rag.reranker.model)
+        logger.info("Reranker 동적 배칭 활성화")
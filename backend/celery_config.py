@@ -4,11 +4,20 @@ Celery 설정
 """
 
 from celery import Celery
+from kombu.serialization import register
+import orjson
 import os
+import sys
+from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# 프로젝트 루트(config, extract, rag)를 import 경로에 한 번만 추가
+PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
 # Redis 설정
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
@@ -18,18 +27,37 @@ RESULT_DB = int(os.getenv("REDIS_RESULT_DB", 1))
 BROKER_URL = f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
 RESULT_BACKEND = f"redis://{REDIS_HOST}:{REDIS_PORT}/{RESULT_DB}"
 
+# 자식 프로세스 RSS 상한 (KB, prefork). 워밍업 후 RSS(BGE-M3 fp32 약 2.2GB + Reranker)보다
+# 낮으면 Task마다 자식이 재시작되어 모델을 다시 로드하므로, 측정한 값보다 여유 있게 지정 (미지정 시 제한 없음)
+WORKER_MAX_MEMORY_KB = int(os.getenv("CELERY_MAX_MEMORY_PER_CHILD_KB", 0)) or None
+
+# 작업 상태 발행 채널 (task:{task_id})
+TASK_CHANNEL_PREFIX = "task:"
+
+# orjson 직렬화 (stdlib json 대비 빠르고 한글을 \uXXXX 이스케이프 없이 UTF-8로 기록)
+register(
+    'orjson',
+    lambda obj: orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY),
+    orjson.loads,
+    content_type='application/x-orjson',
+    content_encoding='binary'
+)
+
 # Celery 앱 생성
 celery_app = Celery(
     'rag_tasks',
     broker=BROKER_URL,
-    backend=RESULT_BACKEND
+    backend=RESULT_BACKEND,
+    include=['tasks']  # 워커 시작 시 Task와 워밍업 시그널 등록
 )
 
 # Celery 설정
 celery_app.conf.update(
-    task_serializer='json',
-    accept_content=['json'],
-    result_serializer='json',
+    task_serializer='msgpack',  # json보다 빠르고 페이로드가 작음
+    accept_content=['msgpack', 'orjson', 'json'],  # 전환 기간 동안 json 메시지도 허용
+    result_serializer='orjson',  # 결과(요약/메타데이터 등 JSON 형태, numpy 값 포함 가능)는 orjson
+    task_compression='zstd',  # Redis로 전달되는 작업 메시지 압축
+    result_compression='zstd',
     timezone='Asia/Seoul',
     enable_utc=True,
     task_track_started=True,
@@ -37,6 +65,8 @@ celery_app.conf.update(
     task_time_limit=600,  # 작업 최대 실행 시간 600초
     task_soft_time_limit=580,  # 소프트 타임 리밋 580초
     worker_prefetch_multiplier=1,  # 워커가 동시에 처리할 작업 수
+    worker_max_tasks_per_child=50,  # 파싱/임베딩 버퍼로 인한 힙 단편화 누적 방지 (prefork)
+    worker_max_memory_per_child=WORKER_MAX_MEMORY_KB,  # 자식 프로세스 RSS 상한 (KB, prefork)
     task_acks_late=True,  # 작업 완료 후 확인
 )
 
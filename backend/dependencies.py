@@ -5,25 +5,30 @@ RAG 시스템 인스턴스 관리
 
 import sys
 import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
 
-# 프로젝트 루트 경로 추가
+from cachetools import TTLCache, cached
+
+# 프로젝트 루트 경로 추가 (이미 있으면 생략)
 PROJECT_ROOT = Path(__file__).parent.parent
-sys.path.insert(0, str(PROJECT_ROOT))
+if str(PROJECT_ROOT.resolve()) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT.resolve()))
 
 from rag.pipeline import RAGPipeline
 import config
+from batched_embedder import enable_dynamic_batching
 
 logger = logging.getLogger(__name__)
 
-# RAG 파이프라인 싱글톤 인스턴스
-_rag_instance: Optional[RAGPipeline] = None
+# 벡터 저장소 문서 수 캐시 (/api/health 폴링 대비 5초 TTL)
+VECTOR_STORE_COUNT_TTL = 5
 
 
+@lru_cache(maxsize=1)
 def get_rag_pipeline() -> RAGPipeline:
     """
-    RAG 파이프라인 인스턴스 반환 
+    RAG 파이프라인 인스턴스 반환 (싱글톤, 초기화 실패 시 캐시되지 않음)
     
     Returns:
         RAGPipeline: RAG 파이프라인 인스턴스
@@ -31,24 +36,36 @@ def get_rag_pipeline() -> RAGPipeline:
     Raises:
         RuntimeError: RAG 시스템 초기화 실패 시
     """
-    global _rag_instance
-    
-    if _rag_instance is None:
-        try:
-            logger.info("RAG 파이프라인 초기화 중...")
-            _rag_instance = RAGPipeline(load_existing=True)
-            logger.info("RAG 파이프라인 초기화 완료")
-        except Exception as e:
-            logger.error(f"RAG 파이프라인 초기화 실패: {e}")
-            raise RuntimeError(f"RAG 시스템 초기화 실패: {str(e)}")
+    try:
+        logger.info("RAG 파이프라인 초기화 중...")
+        rag = RAGPipeline(load_existing=True)
+        # 동시 요청의 임베딩/재정렬 호출을 하나의 forward pass로 병합
+        enable_dynamic_batching(rag)
+        logger.info("RAG 파이프라인 초기화 완료")
+        return rag
+    except Exception as e:
+        logger.error(f"RAG 파이프라인 초기화 실패: {e}")
+        raise RuntimeError(f"RAG 시스템 초기화 실패: {str(e)}")
+
+
+@cached(TTLCache(maxsize=1, ttl=VECTOR_STORE_COUNT_TTL), key=lambda rag: "count")
+def get_vector_store_count(rag: RAGPipeline) -> int:
+    """
+    벡터 저장소 문서 수 반환 (TTL 캐시)
     
-    return _rag_instance
+    Args:
+        rag: RAG 파이프라인 인스턴스
+        
+    Returns:
+        컬렉션 문서 수
+    """
+    return rag.vector_store.collection.count()
 
 
 def reset_rag_pipeline():
     """RAG 파이프라인 인스턴스 리셋 (테스트/디버깅용)"""
-    global _rag_instance
-    _rag_instance = None
+    get_rag_pipeline.cache_clear()
+    get_vector_store_count.cache_clear()
     logger.info("RAG 파이프라인 인스턴스 리셋됨")
 
 
@@ -0,0 +1,275 @@
+"""
+임베딩 캐시
+청크 텍스트의 내용 해시로 임베딩 벡터를 Redis에 저장/조회하고,
+MinHash LSH로 거의 같은 청크(오타 수정, 공백 변경 등)의 임베딩도 재사용
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import redis
+
+import config
+from celery_config import RESULT_BACKEND
+
+logger = logging.getLogger(__name__)
+
+# 캐시 설정
+EMBED_CACHE_URL = os.getenv("EMBED_CACHE_URL", RESULT_BACKEND)
+EMBED_CACHE_PREFIX = "cache:"
+EMBED_CACHE_TTL = int(os.getenv("EMBED_CACHE_TTL", 30 * 24 * 3600))  # 기본 30일
+EMBED_CACHE_FORMAT = "i8"  # 벡터별 float32 scale + int8 값 (float32 대비 약 1/4, 형식 변경 시 키 분리)
+
+# 유사 청크 (MinHash LSH) 설정
+FUZZY_NUM_PERM = 128
+FUZZY_SHINGLE_SIZE = 5  # 공백 기준 5-gram
+
+_client: Optional[redis.Redis] = None
+_lsh_indexes: Dict[str, Any] = {}  # "{provider}:{model}" -> MinHashLSH (사용 불가 시 None)
+_local = threading.local()  # gevent 사용 시 greenlet 단위로 분리됨
+
+
+def _get_client() -> redis.Redis:
+    """Redis 클라이언트 반환 (최초 호출 시 생성)"""
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(EMBED_CACHE_URL)
+    return _client
+
+
+def content_hash(text: str, provider: str, model: str) -> str:
+    """
+    청크 텍스트 + 추론 백엔드 + 모델 이름의 SHA-256 해시
+
+    Args:
+        text: 청크 텍스트
+        provider: 추론 백엔드 (예: "onnx-int8")
+        model: 임베딩 모델 이름
+
+    Returns:
+        16진수 해시 문자열
+    """
+    return hashlib.sha256(f"{provider}\0{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+def _key(model: str, digest: str) -> str:
+    return f"{EMBED_CACHE_PREFIX}{EMBED_CACHE_FORMAT}:{model}:{digest}"
+
+
+def _quantize(vector: np.ndarray) -> bytes:
+    """벡터를 float32 scale(4 bytes) + int8 값으로 직렬화"""
+    vector = np.asarray(vector, dtype=np.float32)
+    scale = np.float32(np.abs(vector).max() / 127) or np.float32(1)
+    return scale.tobytes() + np.round(vector / scale).astype(np.int8).tobytes()
+
+
+def _dequantize(data: bytes) -> np.ndarray:
+    """_quantize의 역변환 (float32 벡터)"""
+    scale = np.frombuffer(data, dtype=np.float32, count=1)[0]
+    return np.frombuffer(data, dtype=np.int8, offset=4).astype(np.float32) * scale
+
+
+def lookup(hashes: List[str], provider: str, model: str) -> Dict[str, np.ndarray]:
+    """
+    캐시된 임베딩 조회 (MGET 한 번)
+
+    Args:
+        hashes: content_hash 리스트
+        provider: 추론 백엔드
+        model: 임베딩 모델 이름
+
+    Returns:
+        {해시: float32 벡터} (캐시에 있는 항목만, Redis 오류 시 빈 딕셔너리)
+    """
+    if not hashes:
+        return {}
+    try:
+        values = _get_client().mget([_key(model, h) for h in hashes])
+    except redis.RedisError as e:
+        logger.warning(f"임베딩 캐시 조회 실패 ({provider}): {e}")
+        return {}
+    return {
+        h: _dequantize(value)
+        for h, value in zip(hashes, values)
+        if value is not None
+    }
+
+
+def store(vectors: Dict[str, np.ndarray], provider: str, model: str):
+    """
+    임베딩을 캐시에 저장 (TTL 적용, 파이프라인으로 한 번에 전송)
+
+    Args:
+        vectors: {해시: 벡터}
+        provider: 추론 백엔드
+        model: 임베딩 모델 이름
+    """
+    if not vectors:
+        return
+    try:
+        pipe = _get_client().pipeline(transaction=False)
+        for h, vector in vectors.items():
+            pipe.set(_key(model, h), _quantize(vector), ex=EMBED_CACHE_TTL)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"임베딩 캐시 저장 실패 ({provider}): {e}")
+
+
+def _get_lsh(provider: str, model: str):
+    """
+    Redis에 저장되는 MinHash LSH 인덱스 반환 (backend/model 조합별로 분리)
+
+    Returns:
+        MinHashLSH (datasketch 미설치, Redis 오류 또는 비활성화 시 None)
+    """
+    name = f"{provider}:{model}"
+    if name not in _lsh_indexes:
+        lsh = None
+        if config.FUZZY_CACHE_THRESHOLD > 0:
+            try:
+                from datasketch import MinHashLSH
+                lsh = MinHashLSH(
+                    threshold=config.FUZZY_CACHE_THRESHOLD,
+                    num_perm=FUZZY_NUM_PERM,
+                    storage_config={
+                        "type": "redis",
+                        "basename": f"{EMBED_CACHE_PREFIX}lsh:{name}:".encode("utf-8"),
+                        "redis": redis.connection.parse_url(EMBED_CACHE_URL)
+                    }
+                )
+            except (ImportError, redis.RedisError) as e:
+                logger.warning(f"유사 청크 캐시 비활성화 ({name}): {e}")
+        _lsh_indexes[name] = lsh
+    return _lsh_indexes[name]
+
+
+def _minhash(text: str):
+    """공백 기준 FUZZY_SHINGLE_SIZE-gram 집합의 MinHash"""
+    from datasketch import MinHash
+
+    tokens = text.split()
+    size = FUZZY_SHINGLE_SIZE
+    shingles = {" ".join(tokens[i:i + size]) for i in range(max(1, len(tokens) - size + 1))}
+    minhash = MinHash(num_perm=FUZZY_NUM_PERM)
+    minhash.update_batch([shingle.encode("utf-8") for shingle in shingles])
+    return minhash
+
+
+def last_hit_ratio() -> Optional[float]:
+    """현재 스레드(greenlet)에서 마지막으로 처리한 embed_documents의 캐시 적중률"""
+    return getattr(_local, "hit_ratio", None)
+
+
+class CachedEmbedder:
+    """
+    임베더 앞단의 내용 해시 캐시
+
+    캐시에 없는 청크(유사 청크 포함)만 원본 임베더로 보내고 결과를 캐시에 기록.
+    embed_documents 외의 속성은 원본 임베더로 위임
+    """
+
+    def __init__(self, embedder):
+        """
+        Args:
+            embedder: DocumentEmbedder (모델은 동적 배칭 프록시로 교체된 상태)
+        """
+        self.embedder = embedder
+        self.model = embedder.model_name
+        self.provider = f"{embedder.backend}-{getattr(embedder, 'precision', 'fp32')}"
+        # content_hash의 고정 접두부(provider, model)를 미리 해시해 두고 청크마다 copy 후 본문만 추가
+        self._hash_prefix = hashlib.sha256(f"{self.provider}\0{self.model}\0".encode("utf-8"))
+
+    def __getattr__(self, name):
+        return getattr(self.embedder, name)
+
+    def embed_documents(self, documents, batch_size: int = 32, show_progress: bool = True) -> np.ndarray:
+        """DocumentEmbedder.embed_documents와 동일한 인터페이스 (캐시 경유)"""
+        if not documents:
+            _local.hit_ratio = None
+            return np.array([])
+
+        # 텍스트 추출과 해시 계산을 한 번의 순회로 처리하고, 이후 단계는 texts를 재사용
+        texts = []
+        hashes = []
+        for doc in documents:
+            text = doc.page_content
+            hasher = self._hash_prefix.copy()
+            hasher.update(text.encode("utf-8"))
+            texts.append(text)
+            hashes.append(hasher.hexdigest())
+        cached = lookup(hashes, self.provider, self.model)
+        misses = [i for i, h in enumerate(hashes) if h not in cached]
+
+        new_vectors = {}
+        minhashes = {}
+        lsh = _get_lsh(self.provider, self.model) if misses else None
+        if lsh is not None:
+            misses = self._reuse_near_duplicates(lsh, texts, hashes, misses, new_vectors, minhashes)
+
+        if misses:
+            computed = self.embedder.embed_texts(
+                [texts[i] for i in misses],
+                batch_size=batch_size,
+                show_progress=show_progress
+            )
+            new_vectors.update((hashes[i], computed[j]) for j, i in enumerate(misses))
+            if lsh is not None:
+                self._index_minhashes(lsh, {hashes[i]: minhashes[i] for i in misses if i in minhashes})
+
+        store(new_vectors, self.provider, self.model)
+        cached.update(new_vectors)
+
+        _local.hit_ratio = 1 - len(misses) / len(documents)
+        logger.info(f"임베딩 캐시 적중: {len(documents) - len(misses)}/{len(documents)}")
+        return np.stack([cached[h] for h in hashes]).astype(np.float32, copy=False)
+
+    def _reuse_near_duplicates(self, lsh, texts, hashes, misses, new_vectors, minhashes) -> List[int]:
+        """
+        LSH로 찾은 유사 청크의 캐시된 임베딩을 재사용
+
+        Args:
+            lsh: MinHashLSH 인덱스
+            texts: 청크 텍스트 리스트
+            hashes: 청크별 content_hash
+            misses: 정확 일치 캐시에 없는 인덱스
+            new_vectors: 재사용한 임베딩을 기록할 딕셔너리 ({해시: 벡터})
+            minhashes: 계산한 MinHash를 기록할 딕셔너리 ({인덱스: MinHash})
+
+        Returns:
+            여전히 임베딩이 필요한 인덱스 리스트
+        """
+        try:
+            candidates = {}
+            for i in misses:
+                minhashes[i] = _minhash(texts[i])
+                candidates[i] = lsh.query(minhashes[i])
+        except redis.RedisError as e:
+            logger.warning(f"유사 청크 조회 실패: {e}")
+            return misses
+
+        found = lookup(sorted({h for keys in candidates.values() for h in keys}), self.provider, self.model)
+        remaining = []
+        for i in misses:
+            match = next((h for h in candidates[i] if h in found), None)
+            if match is None:
+                remaining.append(i)
+            else:
+                new_vectors[hashes[i]] = found[match]
+
+        if len(remaining) < len(misses):
+            logger.info(f"유사 청크 임베딩 재사용: {len(misses) - len(remaining)}개")
+        return remaining
+
+    @staticmethod
+    def _index_minhashes(lsh, minhashes: Dict[str, Any]):
+        """새로 임베딩한 청크를 LSH 인덱스에 추가"""
+        try:
+            with lsh.insertion_session() as session:
+                for h, minhash in minhashes.items():
+                    session.insert(h, minhash, check_duplication=False)
+        except redis.RedisError as e:
+            logger.warning(f"유사 청크 인덱스 갱신 실패: {e}")
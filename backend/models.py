@@ -103,7 +103,7 @@ class DocumentInfo(BaseModel):
     dept_id: str = Field(..., description="부서 ID")
     project_id: str = Field(..., description="프로젝트 ID")
     category: str = Field(..., description="카테고리")
-    upload_date: str = Field(..., description="업로드 일시")
+    upload_date: int = Field(..., description="업로드 일시 (epoch ms)")
     chunks: int = Field(..., description="청크 수")
     total_chapters: Optional[int] = Field(None, description="총 장 수")
     total_articles: Optional[int] = Field(None, description="총 조 수")
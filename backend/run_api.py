@@ -1,21 +1,34 @@
 """
 FastAPI 서버 실행 스크립트
+
+환경변수:
+    API_WORKERS: 워커 프로세스 수 (기본: 1, 워커마다 RAG 모델을 따로 로드함)
+    API_RELOAD: 코드 변경 시 자동 재시작 (개발용, 1이면 활성화 / 멀티 워커와 함께 사용 불가)
 """
 
+import os
+import platform
 import uvicorn
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# uvloop은 Windows 미지원
+LOOP = "asyncio" if platform.system() == "Windows" else "uvloop"
+WORKERS = int(os.getenv("API_WORKERS", 1))
+RELOAD = os.getenv("API_RELOAD", "0") == "1"
+
 if __name__ == "__main__":
-    logger.info("RAG System API 서버 시작...")
+    logger.info(f"RAG System API 서버 시작 (loop={LOOP}, workers={WORKERS})...")
     
     uvicorn.run(
         "api:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=RELOAD,
+        workers=None if RELOAD else WORKERS,
+        loop=LOOP,
+        http="httptools",
         log_level="info"
     )
-
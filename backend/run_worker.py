@@ -1,18 +1,37 @@
 """
 Celery Worker 실행 스크립트
 Windows 및 Unix 호환
+
+환경변수:
+    CELERY_POOL: Unix 워커 풀 종류 (기본: gevent, CPU 위주 작업은 prefork)
+    CELERY_CONCURRENCY: 동시 실행 수 (기본: gevent 100, 그 외 2)
+    CELERY_QUEUES: 구독할 큐 목록 (기본: celery,document_processing,query_processing)
+    CELERY_MAX_MEMORY_PER_CHILD_KB: prefork 자식 RSS 상한 (KB, 기본: 제한 없음, 워밍업 후 RSS보다 크게 지정)
 """
 
-import logging
+import os
 import platform
+
+# gevent 풀은 다른 모듈(redis, celery 등) import 전에 monkey patch 필요
+POOL = os.getenv("CELERY_POOL", "threads" if platform.system() == "Windows" else "gevent")
+if POOL == "gevent":
+    from gevent import monkey
+    monkey.patch_all()
+
+import logging
 from celery_config import celery_app
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 풀 종류별 기본 동시 실행 수 (gevent는 I/O 대기 중 다른 작업으로 전환되므로 크게 설정)
+DEFAULT_CONCURRENCY = {"gevent": 100}
+CONCURRENCY = int(os.getenv("CELERY_CONCURRENCY", DEFAULT_CONCURRENCY.get(POOL, 2)))
+QUEUES = os.getenv("CELERY_QUEUES", "celery,document_processing,query_processing")
+
 if __name__ == "__main__":
-    logger.info(f"Celery Worker 시작 ({platform.system()})...")
-    
+    logger.info(f"Celery Worker 시작 ({platform.system()}, pool={POOL}, concurrency={CONCURRENCY})...")
+
     if platform.system() == "Windows":
         # Windows에서는 pool type을 solo 또는 threads로 설정
         celery_app.worker_main([
@@ -20,20 +39,20 @@ if __name__ == "__main__":
             '--loglevel=info',
             '--pool=threads',
             '--concurrency=2',
-            '--queues=celery,document_processing,query_processing',
-            '--max-tasks-per-child=1000',
+            f'--queues={QUEUES}',
             '--time-limit=600',
             '--soft-time-limit=580'
         ])
     else:
         # Unix/Linux/Mac
+        # 문서 처리는 I/O(파일, ChromaDB, 임베딩/LLM 호출) 위주이므로 gevent 사용
+        # CPU 위주 작업 전용 워커는 CELERY_POOL=prefork CELERY_QUEUES=<큐> 로 별도 실행
         celery_app.worker_main([
             'worker',
             '--loglevel=info',
-            '--concurrency=2',
-            '--queues=celery,document_processing,query_processing',
-            '--max-tasks-per-child=1000',
+            f'--pool={POOL}',
+            f'--concurrency={CONCURRENCY}',
+            f'--queues={QUEUES}',
             '--time-limit=600',
             '--soft-time-limit=580'
         ])
-
@@ -3,30 +3,172 @@ Celery 비동기 작업 정의
 문서 업로드, 임베딩, 저장 등을 백그라운드에서 처리
 """
 
+import ctypes
+import ctypes.util
+import gc
 import logging
+import threading
 import time
-import sys
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
-# 프로젝트 루트 추가 (우선)
-PROJECT_ROOT = Path(__file__).parent.parent
-sys.path.insert(0, str(PROJECT_ROOT))
+import orjson
+import redis
+from celery.signals import worker_init, worker_process_init
+
+# celery_config가 프로젝트 루트를 import 경로에 추가하므로 먼저 import
+from celery_config import celery_app, RESULT_BACKEND, TASK_CHANNEL_PREFIX
 
 import extract
 import config
 
-from celery_config import celery_app
 from dependencies import get_rag_pipeline
+from embedding_cache import CachedEmbedder, last_hit_ratio
 
 logger = logging.getLogger(__name__)
 
+_embedder_lock = threading.Lock()
+
+# glibc malloc_trim (해제된 힙 영역을 OS에 반환, glibc가 아니면 None)
+try:
+    _malloc_trim = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6").malloc_trim
+except (OSError, AttributeError):
+    _malloc_trim = None
+
+
+def release_memory():
+    """순환 참조 정리 후 glibc 힙의 빈 영역을 OS에 반환 (문서 처리 후 RSS 증가 억제)"""
+    gc.collect()
+    if _malloc_trim is not None:
+        _malloc_trim(0)
+
+
+def get_cached_rag_pipeline():
+    """임베더를 임베딩 캐시로 감싼 RAG 파이프라인 반환 (동적 배칭은 get_rag_pipeline에서 적용)"""
+    rag = get_rag_pipeline()
+    with _embedder_lock:
+        if not isinstance(rag.embedder, CachedEmbedder):
+            rag.embedder = CachedEmbedder(rag.embedder)
+    return rag
+
+
+def warm_up_models():
+    """
+    RAG 파이프라인 로드 + 임베딩/Reranker 모델 1회 실행
+    첫 Task가 모델 다운로드/로드와 CUDA 초기화 비용을 떠안지 않도록 워커 시작 시 호출
+    """
+    start_time = time.time()
+    try:
+        rag = get_cached_rag_pipeline()
+        rag.embedder.embed_query("워밍업")
+        if rag.reranker is not None:
+            rag.reranker.model.predict([["워밍업", "워밍업"]])
+    except Exception as e:
+        # 워커는 계속 기동하고 첫 Task에서 다시 로드 시도
+        logger.error(f"모델 워밍업 실패: {e}")
+        return
+    
+    try:
+        import torch
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except ImportError:
+        pass
+    logger.info(f"모델 워밍업 완료 ({time.time() - start_time:.2f}초)")
+
+
+def _is_prefork(worker) -> bool:
+    pool_cls = getattr(worker, "pool_cls", "")
+    name = pool_cls if isinstance(pool_cls, str) else pool_cls.__module__
+    return name.endswith(("prefork", "processes"))
+
+
+@worker_init.connect
+def warm_up_worker(sender=None, **kwargs):
+    """gevent/threads/solo 풀: Task를 실행하는 메인 프로세스에서 워밍업"""
+    if not _is_prefork(sender):
+        warm_up_models()
+
+
+@worker_process_init.connect
+def warm_up_worker_process(**kwargs):
+    """prefork 풀: fork된 자식 프로세스마다 워밍업 (CUDA 컨텍스트는 fork 후 생성)"""
+    warm_up_models()
+
+
+_redis_client: Optional[redis.Redis] = None
+
+
+def publish_task_state(task_id: str, *states: Dict[str, Any]):
+    """
+    작업 상태를 Redis 채널(task:{task_id})로 발행
+    API 서버는 이를 구독하여 폴링 없이 상태를 전달
+    여러 상태는 파이프라인으로 묶어 한 번의 왕복으로 발행
+    
+    Args:
+        task_id: 작업 ID
+        states: TaskStatusResponse 형식의 상태 (task_id 제외, 발행 순서대로)
+    """
+    global _redis_client
+    
+    try:
+        if _redis_client is None:
+            _redis_client = redis.Redis.from_url(RESULT_BACKEND)
+        channel = f"{TASK_CHANNEL_PREFIX}{task_id}"
+        pipe = _redis_client.pipeline(transaction=False)
+        for state in states:
+            pipe.publish(channel, orjson.dumps(state))
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"[Task {task_id}] 상태 발행 실패: {e}")
+
+
+class ProgressReporter:
+    """
+    진행 상태를 모아 두었다가 한 번에 기록
+    
+    곧바로 다음 단계로 넘어가는 상태는 flush=False로 쌓아 두고, 긴 작업(파싱, 임베딩) 직전에
+    Celery 백엔드 갱신 1회 + 채널 발행 1회(파이프라인)로 내보내 Redis 왕복을 줄임
+    """
+    
+    def __init__(self, task):
+        """
+        Args:
+            task: bind=True로 등록된 Celery Task
+        """
+        self.task = task
+        self._pending: List[Dict[str, Any]] = []
+    
+    def report(self, stage: str, progress: int, message: str, flush: bool = True):
+        """진행 상태 추가 (flush=True면 즉시 기록)"""
+        self._pending.append({'status': 'processing', 'stage': stage, 'progress': progress, 'message': message})
+        if flush:
+            self.flush()
+    
+    def flush(self, final_state: Optional[Dict[str, Any]] = None):
+        """
+        쌓인 진행 상태 기록
+        
+        Args:
+            final_state: 함께 발행할 최종 상태 (완료/실패, Celery 백엔드에는 Task 반환값으로 저장됨)
+        """
+        states = self._pending
+        self._pending = []
+        if final_state is None and states:
+            meta = {key: value for key, value in states[-1].items() if key != 'status'}
+            self.task.update_state(state='PROGRESS', meta=meta)
+        if final_state is not None:
+            states.append(final_state)
+        if states:
+            publish_task_state(self.task.request.id, *states)
+
 
 @celery_app.task(bind=True, name='backend.tasks.process_document')
 def process_document(
     self,
     file_path: str,
-    user_metadata: Dict[str, Any]
+    user_metadata: Dict[str, Any],
+    file_hash: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     비동기 문서 처리 (파싱 + 임베딩 + 저장)
@@ -34,76 +176,43 @@ def process_document(
     Args:
         file_path: 업로드된 파일 경로
         user_metadata: 사용자 메타데이터
+        file_hash: 업로드 시 계산된 파일 해시 (blake2b)
         
     Returns:
         처리 결과 딕셔너리
     """
+    progress = ProgressReporter(self)
     try:
         start_time = time.time()
         
         # 1단계: 문서 파싱
         logger.info(f"[Task {self.request.id}] 문서 파싱 시작: {file_path}")
-        self.update_state(
-            state='PROGRESS',
-            meta={
-                'stage': '파싱 중',
-                'progress': 10,
-                'message': 'HWP/HWPX 문서를 파싱하고 있습니다...'
-            }
-        )
+        progress.report('파싱 중', 10, 'HWP/HWPX 문서를 파싱하고 있습니다...')
         
         file_path_obj = Path(file_path)
         extracted_dir = extract.run_extraction(str(file_path_obj))
         logger.info(f"[Task {self.request.id}] 파싱 완료: {extracted_dir}")
         
         # 2단계: 구조 분석 (extract.py 내부에서 수행됨)
-        self.update_state(
-            state='PROGRESS',
-            meta={
-                'stage': '구조 분석 중',
-                'progress': 30,
-                'message': '문서 구조를 분석하고 있습니다...'
-            }
-        )
+        progress.report('구조 분석 중', 30, '문서 구조를 분석하고 있습니다...', flush=False)
         
         # 3단계: 요약 생성
-        self.update_state(
-            state='PROGRESS',
-            meta={
-                'stage': '요약 생성 중',
-                'progress': 40,
-                'message': '문서 요약을 생성하고 있습니다...'
-            }
-        )
+        progress.report('요약 생성 중', 40, '문서 요약을 생성하고 있습니다...', flush=False)
         logger.info(f"[Task {self.request.id}] 요약 생성 중...")
         
         # 4단계: RAG 파이프라인에 추가
-        self.update_state(
-            state='PROGRESS',
-            meta={
-                'stage': '임베딩 생성 중',
-                'progress': 50,
-                'message': '벡터 임베딩을 생성하고 있습니다...'
-            }
-        )
+        progress.report('임베딩 생성 중', 50, '벡터 임베딩을 생성하고 있습니다...')
         logger.info(f"[Task {self.request.id}] RAG 파이프라인 추가 중...")
         
         try:
-            rag = get_rag_pipeline()
+            rag = get_cached_rag_pipeline()
             result = rag.add_document_from_extract(
                 extracted_dir=extracted_dir,
                 user_metadata=user_metadata
             )
             
             # 진행 상황 업데이트 (임베딩 진행 중)
-            self.update_state(
-                state='PROGRESS',
-                meta={
-                    'stage': '저장 중',
-                    'progress': 90,
-                    'message': 'ChromaDB에 저장하고 있습니다...'
-                }
-            )
+            progress.report('저장 중', 90, 'ChromaDB에 저장하고 있습니다...', flush=False)
             
             processing_time = time.time() - start_time
             logger.info(f"[Task {self.request.id}] 문서 처리 완료 ({processing_time:.2f}초)")
@@ -117,8 +226,18 @@ def process_document(
                 'chunks': result.get('chunks_added', 0),
                 'processing_time': processing_time,
                 'metadata': result.get('metadata', {}),
+                'file_hash': file_hash,
+                'cache_hit_ratio': last_hit_ratio(),
                 'message': '문서 처리가 완료되었습니다.'
             }
+            result = None  # 파이프라인 결과 참조 해제
+            progress.flush({
+                'status': 'completed',
+                'progress': 100,
+                'stage': '완료',
+                'message': '문서 처리가 완료되었습니다.',
+                'result': final_result
+            })
             
             return final_result
             
@@ -141,6 +260,12 @@ def process_document(
                 'message': '문서 처리 중 오류가 발생했습니다.'
             }
         )
+        progress.flush({
+            'status': 'failed',
+            'progress': 0,
+            'message': '작업 처리 중 오류가 발생했습니다.',
+            'error': error_msg
+        })
         
         return {
             'status': 'failed',
@@ -148,6 +273,9 @@ def process_document(
             'processing_time': processing_time,
             'message': f'처리 실패: {error_msg}'
         }
+    
+    finally:
+        release_memory()
 
 
 @celery_app.task(bind=True, name='backend.tasks.process_query')
@@ -3,18 +3,31 @@
 파일 관리, 검증, 메타데이터 처리 등
 """
 
+import asyncio
+import hashlib
 import logging
+import mmap
 import os
-import uuid
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any
-from datetime import datetime
-import aiofiles
+from typing import Optional, Dict, Any, Tuple, BinaryIO
 
 import config
 
 logger = logging.getLogger(__name__)
 
+# 업로드 설정
+MAX_UPLOAD_SIZE_MB = 10
+MAX_UPLOAD_SIZE_BYTES = MAX_UPLOAD_SIZE_MB * 1024 * 1024
+ALLOWED_EXTENSIONS = frozenset(('.hwp', '.hwpx'))
+_UNSUPPORTED_EXT_MSG = "지원하지 않는 파일 형식입니다. (지원: .hwp, .hwpx)"
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB 단위로 스트리밍 저장
+
+# 디스크 I/O 전용 스레드 풀 (기본 executor를 쓰는 다른 라이브러리와 경합 방지)
+DISK_IO_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="disk-io")
+
 
 # ========================================
 # 파일 관리
@@ -46,59 +59,152 @@ def generate_upload_path(dept_id: str, filename: str) -> Path:
     Returns:
         업로드할 파일 경로
     """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    upload_path = config.UPLOADS_DIR / dept_id / f"{timestamp}_{filename}"
-    upload_path.parent.mkdir(parents=True, exist_ok=True)
-    return upload_path
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    # 부서별 디렉토리는 처음 업로드할 때 한 번만 생성
+    return config.ensure_dir(config.UPLOADS_DIR / dept_id) / f"{timestamp}_{filename}"
 
 
-async def save_upload_file(file_content: bytes, upload_path: Path) -> Path:
+def _copy_upload(src: BinaryIO, upload_path: Path, max_size_bytes: int) -> Tuple[int, str]:
+    """
+    업로드 파일 객체를 청크 단위로 복사 (DISK_IO_EXECUTOR에서 실행)
+    
+    Returns:
+        (복사한 크기, blake2b 해시) - 최대 크기 초과 시 크기만 초과값으로 반환
     """
-    업로드된 파일 저장
+    size = 0
+    hasher = hashlib.blake2b()
+    
+    # 파이썬 파일 객체의 버퍼를 거치지 않고 fd에 직접 기록
+    fd = os.open(upload_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while chunk := src.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_size_bytes:
+                break
+            hasher.update(chunk)
+            view = memoryview(chunk)
+            while view:
+                view = view[os.write(fd, view):]
+        # Celery 워커가 읽기 전에 디스크 반영 보장
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    
+    return size, hasher.hexdigest()
+
+
+def _copy_upload_mmap(src: BinaryIO, upload_path: Path, size: int) -> Tuple[int, str]:
+    """
+    크기를 알고 있는 업로드 파일을 미리 잡아둔 mmap 영역에 복사 (DISK_IO_EXECUTOR에서 실행)
+    
+    Returns:
+        (복사한 크기, blake2b 해시)
+        
+    Raises:
+        IOError: 실제 내용 크기가 선언된 크기와 다를 때
+    """
+    offset = 0
+    hasher = hashlib.blake2b()
+    
+    fd = os.open(upload_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.ftruncate(fd, size)
+        with mmap.mmap(fd, size) as mm:
+            while chunk := src.read(UPLOAD_CHUNK_SIZE):
+                end = offset + len(chunk)
+                if end > size:
+                    raise IOError(f"업로드 크기 불일치 (선언: {size} bytes)")
+                mm[offset:end] = chunk
+                hasher.update(chunk)
+                offset = end
+            mm.flush()
+    finally:
+        os.close(fd)
+    
+    if offset != size:
+        raise IOError(f"업로드 크기 불일치 (선언: {size} bytes, 실제: {offset} bytes)")
+    return offset, hasher.hexdigest()
+
+
+async def save_upload_file(
+    upload_file,
+    upload_path: Path,
+    max_size_mb: int = MAX_UPLOAD_SIZE_MB
+) -> Tuple[Path, int, str]:
+    """
+    업로드된 파일을 청크 단위로 스트리밍 저장
+    파일 전체를 메모리에 올리지 않고 크기와 해시를 저장하면서 계산하며,
+    블로킹 디스크 I/O는 이벤트 루프 대신 DISK_IO_EXECUTOR에서 수행
+    업로드 크기를 알 수 있으면 저장 전에 크기를 검증하고 mmap으로 기록
     
     Args:
-        file_content: 파일 내용
-        upload_path: 저장할 경로
+        upload_file: FastAPI UploadFile
+        upload_path: 저장할 경로 (generate_upload_path로 생성, 상위 디렉토리가 있어야 함)
+        max_size_mb: 최대 파일 크기 (MB)
         
     Returns:
-        저장된 파일 경로
+        (저장된 파일 경로, 파일 크기, blake2b 해시)
         
     Raises:
+        ValueError: 최대 파일 크기 초과 시 (저장 중이던 파일은 삭제)
         IOError: 파일 저장 실패 시
     """
+    max_size_bytes = max_size_mb * 1024 * 1024
+    declared_size = getattr(upload_file, "size", None)
+    if declared_size is not None and declared_size > max_size_bytes:
+        raise ValueError(f"파일 크기가 {max_size_mb}MB를 초과합니다.")
+    
+    loop = asyncio.get_running_loop()
     try:
-        upload_path.parent.mkdir(parents=True, exist_ok=True)
-        async with aiofiles.open(upload_path, 'wb') as f:
-            await f.write(file_content)
-        logger.info(f"파일 저장 완료: {upload_path}")
-        return upload_path
+        if declared_size:
+            size, file_hash = await loop.run_in_executor(
+                DISK_IO_EXECUTOR, _copy_upload_mmap, upload_file.file, upload_path, declared_size
+            )
+        else:
+            size, file_hash = await loop.run_in_executor(
+                DISK_IO_EXECUTOR, _copy_upload, upload_file.file, upload_path, max_size_bytes
+            )
     except IOError as e:
         logger.error(f"파일 저장 실패: {e}")
+        upload_path.unlink(missing_ok=True)
         raise IOError(f"파일 저장 실패: {str(e)}")
+    
+    if size > max_size_bytes:
+        upload_path.unlink(missing_ok=True)
+        raise ValueError(f"파일 크기가 {max_size_mb}MB를 초과합니다.")
+    
+    logger.info(f"파일 저장 완료: {upload_path} ({size} bytes)")
+    return upload_path, size, file_hash
 
 
-def validate_file(filename: str, file_size: int, max_size_mb: int = 10) -> tuple[bool, str]:
+def validate_file(
+    filename: str,
+    file_size: Optional[int] = None,
+    max_size_mb: int = MAX_UPLOAD_SIZE_MB
+) -> tuple[bool, str]:
     """
     파일 검증
     
     Args:
         filename: 파일명
-        file_size: 파일 크기 (바이트)
+        file_size: 파일 크기 (바이트, None이면 확장자만 확인)
         max_size_mb: 최대 파일 크기 (MB)
         
     Returns:
         (유효 여부, 메시지)
     """
-    # 파일 확장자 확인
-    allowed_extensions = {'.hwp', '.hwpx'}
-    file_ext = Path(filename).suffix.lower()
+    # 파일 확장자 확인 (Path 객체 생성 없이 마지막 '.' 이후만 비교)
+    dot = filename.rfind('.')
+    file_ext = filename[dot:].lower() if dot > 0 else ''
+    
+    if file_ext not in ALLOWED_EXTENSIONS:
+        return False, _UNSUPPORTED_EXT_MSG
     
-    if file_ext not in allowed_extensions:
-        return False, f"지원하지 않는 파일 형식입니다. (지원: {', '.join(allowed_extensions)})"
+    if file_size is None:
+        return True, "유효한 파일입니다."
     
     # 파일 크기 확인
-    max_size_bytes = max_size_mb * 1024 * 1024
-    if file_size > max_size_bytes:
+    if file_size > max_size_mb * 1024 * 1024:
         return False, f"파일 크기가 {max_size_mb}MB를 초과합니다."
     
     if file_size == 0:
@@ -134,10 +240,20 @@ def build_user_metadata(
         "dept_id": dept_id,
         "project_id": project_id,
         "category": category,
-        "upload_date": datetime.utcnow().isoformat() + "Z"
+        "upload_date": int(time.time() * 1000)  # epoch ms (ChromaDB 숫자 범위 필터 가능)
     }
 
 
+# 필터 필드 순서 (build_query_filters의 인자 순서와 동일)
+FILTER_FIELDS = ("dept_id", "project_id", "category", "chapter_number", "article_number")
+
+
+@lru_cache(maxsize=1024)
+def _filter_pairs(values: Tuple[Optional[str], ...]) -> Tuple[Tuple[str, str], ...]:
+    """값 조합별 (필드, 값) 쌍 (값이 있는 필드만, 불변 튜플이므로 캐시 공유 가능)"""
+    return tuple((name, value) for name, value in zip(FILTER_FIELDS, values) if value)
+
+
 def build_query_filters(
     dept_id: Optional[str] = None,
     project_id: Optional[str] = None,
@@ -156,23 +272,13 @@ def build_query_filters(
         article_number: 조 번호 필터
         
     Returns:
-        필터 딕셔너리
+        where 필터 딕셔너리 (값이 있는 필드만 포함, 2개 이상이면 $and, 호출마다 새로 생성)
     """
-    filters = {}
-    
-    # 단일 필터
-    if dept_id:
-        filters["dept_id"] = dept_id
-    if project_id:
-        filters["project_id"] = project_id
-    if category:
-        filters["category"] = category
-    if chapter_number:
-        filters["chapter_number"] = chapter_number
-    if article_number:
-        filters["article_number"] = article_number
-    
-    return filters
+    clauses = [{name: value} for name, value in _filter_pairs((dept_id, project_id, category, chapter_number, article_number))]
+    if not clauses:
+        return {}
+    # ChromaDB는 여러 조건을 한 딕셔너리에 담을 수 없으므로 $and로 결합
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
 
 
 # ========================================
@@ -214,12 +320,12 @@ def create_error_response(
 
 def generate_request_id() -> str:
     """
-    요청 추적용 고유 ID 생성
+    요청 추적용 고유 ID 생성 (로그 추적용이므로 UUID 객체 대신 랜덤 hex 사용)
     
     Returns:
-        생성된 요청 ID
+        생성된 요청 ID (32자리 hex, UUID4와 같은 128비트)
     """
-    return str(uuid.uuid4())
+    return os.urandom(16).hex()
 
 
 # ========================================
@@ -236,23 +342,21 @@ def format_answer_sources(sources: list) -> list:
     Returns:
         포맷팅된 소스 리스트
     """
-    formatted_sources = []
-    
-    for idx, source in enumerate(sources, 1):
-        formatted_source = {
+    # source.get을 소스마다 한 번만 바인딩
+    return [
+        {
             "index": idx,
-            "doc_name": source.get("doc_name", "Unknown"),
-            "chapter_number": source.get("chapter_number"),
-            "chapter_title": source.get("chapter_title"),
-            "article_number": source.get("article_number"),
-            "article_title": source.get("article_title"),
-            "hierarchy_path": source.get("hierarchy_path"),
-            "score": source.get("score", 0.0),
-            "table_id": source.get("table_id")
+            "doc_name": get("doc_name", "Unknown"),
+            "chapter_number": get("chapter_number"),
+            "chapter_title": get("chapter_title"),
+            "article_number": get("article_number"),
+            "article_title": get("article_title"),
+            "hierarchy_path": get("hierarchy_path"),
+            "score": get("score", 0.0),
+            "table_id": get("table_id")
         }
-        formatted_sources.append(formatted_source)
-    
-    return formatted_sources
+        for idx, get in enumerate((source.get for source in sources), 1)
+    ]
 
 
 def format_table_data(tables: list) -> list:
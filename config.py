@@ -4,6 +4,7 @@ RAG 시스템 설정
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -16,10 +17,15 @@ DATA_DIR = PROJECT_ROOT / "data"
 VECTOR_STORE_DIR = DATA_DIR / "vector_store"
 UPLOADS_DIR = DATA_DIR / "uploads"
 EXTRACTED_DIR = PROJECT_ROOT / "extracted_results"  # extract.py 출력 폴더
+MODELS_DIR = DATA_DIR / "models"  # 양자화된 ONNX 모델 캐시
+
+
+@lru_cache(maxsize=None)
+def ensure_dir(path: Path) -> Path:
+    """디렉토리를 처음 사용할 때 한 번만 생성 (import 시점의 mkdir 제거)"""
+    path.mkdir(parents=True, exist_ok=True)
+    return path
 
-# 디렉토리 생성
-for dir_path in [DATA_DIR, VECTOR_STORE_DIR, UPLOADS_DIR, EXTRACTED_DIR]:
-    dir_path.mkdir(parents=True, exist_ok=True)
 
 # API 키
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
@@ -28,6 +34,12 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 EMBEDDING_MODEL = "BAAI/bge-m3"
 EMBEDDING_DIM = 1024
 MAX_SEQ_LENGTH = 8192
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")  # "torch" 또는 "onnx" (ONNX Runtime)
+EMBED_PRECISION = os.getenv("EMBED_PRECISION", "fp32")  # "fp32" 또는 "int8" (onnx + CPU에서만 적용)
+EMBED_QUANT_CONFIG = "avx512_vnni"  # 동적 INT8 양자화 대상 명령어 집합
+ONNX_RUN_WORKERS = int(os.getenv("ONNX_RUN_WORKERS", os.cpu_count() or 1))  # 동시에 실행할 ONNX Run 수 (CUDA)
+ONNX_SUB_BATCH_SIZE = 128  # 동시 실행을 위해 나누는 서브 배치 크기
+FUZZY_CACHE_THRESHOLD = float(os.getenv("FUZZY_CACHE_THRESHOLD", 0.9))  # 유사 청크 임베딩 재사용 Jaccard 임계값 (0이면 비활성화)
 
 # LLM 설정
 LLM_MODEL = "gpt-4o-mini"
@@ -42,6 +54,11 @@ SUMMARY_TEMPERATURE = 0.5  # 요약은 일관성을 위해 낮은 온도 사용
 CHUNK_SIZE = 800  # 토큰
 CHUNK_OVERLAP = 150  # 토큰
 SEPARATORS = ["\n\n", "\n", ".", "!", "?", " ", ""]
+TEXT_SPLITTER = os.getenv("TEXT_SPLITTER", "langchain")  # "langchain" 또는 "native" (semantic-text-splitter, SEPARATORS 미사용)
+
+# 벡터 저장소(ChromaDB HNSW) 설정
+HNSW_BATCH_SIZE = 2000  # 이 수만큼 모아서 HNSW 인덱스에 반영 (기본 100)
+HNSW_SYNC_THRESHOLD = 4000  # 이 수만큼 추가될 때마다 인덱스를 디스크에 저장 (기본 1000)
 
 # 검색 설정
 TOP_K = 5  # 검색할 문서 청크 수
@@ -146,8 +163,7 @@ SUMMARY_PROMPT_TEMPLATE = """다음 문서의 내용을 3-4줄로 간단히 요
 
 # 로깅 설정
 LOG_LEVEL = "INFO"
-LOG_FILE = PROJECT_ROOT / "logs" / "rag_system.log"
-LOG_FILE.parent.mkdir(exist_ok=True)
+LOG_FILE = PROJECT_ROOT / "logs" / "rag_system.log"  # 파일 핸들러 추가 시 ensure_dir(LOG_FILE.parent) 호출
 
 # ============================================================
 # 메타데이터 스키마 정의
@@ -169,7 +185,7 @@ DOCUMENT_METADATA_SCHEMA = {
     # 문서 관리 메타데이터
     "category": "str",                # 카테고리 (예: 인사, 회계, 감사)
     "version": "str",                 # 버전 (예: v1.0, 2024년 개정)
-    "upload_date": "str",             # 업로드 일시 (ISO 8601)
+    "upload_date": "int",             # 업로드 일시 (epoch ms)
     
     # 자동 생성 메타데이터
     "summary": "str",                 # 문서 요약 (자동 생성, 3-4줄)
@@ -13,17 +13,245 @@ HWP/HWPX 통합 추출 스크립트
 """
 
 import zipfile
-import xml.etree.ElementTree as ET
+from array import array
+from lxml import etree as ET
 import json
+import multiprocessing
 import os
 import sys
-import io
 import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
 from jpype_setup import init_jpype
 
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 표준 json 사용
+    orjson = None
+
 # Windows에서 UTF-8 출력을 위한 설정
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+# (기존 스트림을 그대로 두고 인코딩만 변경, 다른 모듈에서 import 해도 stdout 객체가 바뀌지 않음)
+if hasattr(sys.stdout, 'reconfigure'):
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# HWPX 섹션 XML 네임스페이스 및 태그 (Clark 표기, lxml iter/iterparse에 그대로 사용)
+NS = {
+    'hp': 'http://www.hancom.co.kr/hwpml/2011/paragraph',
+    'hc': 'http://www.hancom.co.kr/hwpml/2011/core'
+}
+P_TAG = f"{{{NS['hp']}}}p"
+TBL_TAG = f"{{{NS['hp']}}}tbl"
+TR_TAG = f"{{{NS['hp']}}}tr"
+TC_TAG = f"{{{NS['hp']}}}tc"
+
+# HWPX BinData에서 추출할 이미지 확장자
+_IMG_EXTS = ('.jpg', '.jpeg', '.png', '.bmp', '.gif')
+
+# 섹션 병렬 파싱 설정 (작은 문서는 프로세스 생성 비용이 더 크므로 순차 처리)
+SECTION_WORKERS = 4
+SECTION_PARALLEL_MIN_BYTES = 8 * 1024 * 1024  # 섹션 XML 압축 해제 크기 합
+
+# 이미지 추출 동시 실행 수 (압축 해제/디스크 쓰기 중에는 GIL이 풀림)
+IMAGE_WORKERS = 8
+
+# HWP 일괄 처리 워커 실행 인자 및 결과 줄 접두어
+HWP_WORKER_FLAG = "--hwp-worker"
+HWP_RESULT_PREFIX = "@@HWP_RESULT"
+
+# 결과 파일 쓰기 버퍼 크기
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _element_text(elem):
+    """요소 하위의 모든 텍스트를 이어 붙여 앞뒤 공백을 제거해 반환 (libxml2에서 직렬화, tail 제외)"""
+    return ET.tostring(elem, method='text', encoding='unicode', with_tail=False).strip()
+
+
+def _iter_section_elements(fh):
+    """
+    섹션 XML을 스트리밍 파싱하며 단락(hp:p)과 표(hp:tbl)를 문서 순서(시작 태그 순)로 반환
+    
+    최상위 단락/표가 닫힐 때 그 안의 요소를 모두 내보낸 뒤 트리에서 제거하므로
+    섹션 전체 트리를 메모리에 유지하지 않음.
+    이미지가 포함된 대용량 섹션도 libxml2 기본 제한(텍스트 노드 10MB 등)에 걸리지 않도록 huge_tree 사용
+    
+    Args:
+        fh: 섹션 XML 파일 객체 (bytes)
+    
+    Yields:
+        단락 또는 표 요소 (하위 트리가 모두 파싱된 상태)
+    """
+    pending = []
+    depth = 0
+    for event, elem in ET.iterparse(fh, events=('start', 'end'), tag=(P_TAG, TBL_TAG), huge_tree=True):
+        if event == 'start':
+            pending.append(elem)
+            depth += 1
+            continue
+        
+        depth -= 1
+        if depth == 0:
+            yield from pending
+            pending.clear()
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+
+def _parse_section(fh):
+    """
+    섹션 XML에서 단락 텍스트와 표 추출
+    
+    Args:
+        fh: 섹션 XML 파일 객체 (bytes)
+    
+    Returns:
+        (단락 텍스트 리스트 - 빈 단락 포함, 표 리스트 - 행이 있는 표만)
+    """
+    para_texts = []
+    tables = []
+    t_idx = 0
+    
+    # 단락과 표를 한 번의 스트리밍 파싱으로 처리
+    for elem in _iter_section_elements(fh):
+        if elem.tag == P_TAG:
+            # 텍스트 추출 (단락별, 결과 생성은 섹션 끝에서 일괄 처리)
+            para_texts.append(_element_text(elem))
+            continue
+        
+        # 표(Table) 추출
+        rows = []
+        
+        # 표의 각 행(tr) 처리 (자식 축만 탐색: 셀 안의 중첩 표는 바깥 셀 텍스트와 별도 표로 한 번씩만 반영)
+        for row in elem.iterchildren(TR_TAG):
+            # 각 셀(tc) 처리
+            cells = [_element_text(cell) for cell in row.iterchildren(TC_TAG)]
+            if cells:
+                rows.append(cells)
+        
+        if rows:
+            # 표 요약 생성
+            tables.append({
+                "id": t_idx,
+                "type": "table",
+                "rows": rows,
+                # 병합 셀 등으로 행마다 셀 수가 다를 수 있으므로 가장 긴 행 기준
+                "summary": f"표 {t_idx + 1}: {len(rows)}행 × {max(map(len, rows))}열"
+            })
+        t_idx += 1
+    
+    return para_texts, tables
+
+
+def _parse_section_entry(hwpx_path, section_name):
+    """
+    _parse_section의 프로세스 풀용 진입점
+    
+    워커가 HWPX를 직접 열어 섹션 XML을 스트리밍 파싱하므로
+    부모 프로세스는 섹션 내용을 메모리에 올리거나 워커로 전송하지 않음
+    """
+    with zipfile.ZipFile(hwpx_path, 'r') as z, z.open(section_name) as fh:
+        return _parse_section(fh)
+
+
+def _section_workers(section_infos):
+    """
+    섹션 병렬 파싱에 사용할 프로세스 수 (1이면 순차 처리)
+    
+    섹션이 2개 이상이고 압축 해제 크기 합이 SECTION_PARALLEL_MIN_BYTES 이상일 때만 병렬 처리.
+    데몬 프로세스(Celery prefork 자식 등)는 자식 프로세스를 만들 수 없으므로 순차 처리
+    """
+    if len(section_infos) < 2 or multiprocessing.current_process().daemon:
+        return 1
+    if sum(info.file_size for info in section_infos) < SECTION_PARALLEL_MIN_BYTES:
+        return 1
+    return min(len(section_infos), SECTION_WORKERS, os.cpu_count() or 1)
+
+
+def _write_text(path, parts):
+    """
+    문자열 조각들을 UTF-8로 인코딩해 바이너리 모드로 저장 (텍스트 코덱 계층 없이 큰 버퍼로 기록)
+    
+    Args:
+        path: 저장 경로
+        parts: 문자열 iterable (줄바꿈은 변환 없이 그대로 기록)
+    """
+    with open(path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        f.writelines(part.encode('utf-8') for part in parts)
+
+
+def _dump_json(obj, path):
+    """
+    obj를 들여쓰기 2칸의 UTF-8 JSON 파일로 저장 (orjson 사용 가능 시 orjson)
+    
+    Args:
+        obj: 저장할 객체
+        path: 저장 경로
+    """
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(obj, f, ensure_ascii=False, indent=2)
+
+
+def _extract_images(hwpx_path, image_infos, output_dir):
+    """
+    HWPX 내 이미지 항목들을 output_dir에 저장
+    
+    ZipFile 객체는 스레드 간 공유하지 않도록 호출마다 새로 연다 (중앙 디렉토리만 읽음).
+    항목은 아카이브 내 위치(header_offset) 순으로 읽어 파일을 앞에서부터 순차 접근
+    
+    Args:
+        hwpx_path: HWPX 파일 경로
+        image_infos: 저장할 이미지의 ZipInfo 리스트
+        output_dir: 저장 폴더
+    
+    Returns:
+        이미지 정보 리스트 (image_infos 순서)
+    """
+    images = [None] * len(image_infos)
+    with zipfile.ZipFile(hwpx_path, 'r') as z:
+        for idx in sorted(range(len(image_infos)), key=lambda i: image_infos[i].header_offset):
+            img_info = image_infos[idx]
+            img_name = os.path.basename(img_info.filename)
+            
+            # 이미지 파일 저장 (전체를 메모리에 올리지 않고 1MB 단위로 복사)
+            img_path = os.path.join(output_dir, img_name)
+            with z.open(img_info) as src, open(img_path, 'wb') as f:
+                shutil.copyfileobj(src, f, length=1 << 20)
+            
+            images[idx] = {
+                "filename": img_name,
+                "path": img_path,
+                "size": img_info.file_size
+            }
+    return images
+
+
+# 문서 구조(장/조/항/호) 정규식 패턴
+# 여러 줄 텍스트 전체를 finditer로 한 번에 훑도록 MULTILINE 사용, 종류는 lastgroup으로 판별.
+# 줄 앞뒤 공백은 무시하고(기존 strip과 동일), 줄을 넘지 않도록 공백은 [^\S\n]으로 제한
+_STRUCTURE_LINE_RE = re.compile(
+    r'^[^\S\n]*(?:'
+    r'(?P<chapter>제[^\S\n]*(?P<chapter_num>\d+)[^\S\n]*장[^\S\n]+(?P<chapter_title>\S.*))'  # 제1장 총칙
+    r'|(?P<article>제[^\S\n]*(?P<article_num>\d+)[^\S\n]*조[^\S\n]*(?:\((?P<article_title>.+?)\))?.*)'  # 제5조 (급여의 계산)
+    r'|(?P<paragraph>(?P<para_num>[①②③④⑤⑥⑦⑧⑨⑩]|\d+\)).*)'  # ① 내용, 1) 내용
+    r'|(?P<subparagraph>(?P<subpara_letter>[가나다라마바사아자차카타파하])\.[^\S\n]+\S.*)'  # 가. 내용
+    r')$',
+    re.MULTILINE
+)
+
+# structure_map 'type' 열의 종류 코드 (튜플 인덱스)
+STRUCTURE_TYPES = ('chapter', 'article', 'paragraph', 'subparagraph')
+_STRUCTURE_TYPE_CODES = {kind: code for code, kind in enumerate(STRUCTURE_TYPES)}
+
+# 항 번호(원문자) → 숫자 문자열
+_CIRCLED_NUMBERS = {'①': '1', '②': '2', '③': '3', '④': '4', '⑤': '5',
+                    '⑥': '6', '⑦': '7', '⑧': '8', '⑨': '9', '⑩': '10'}
 
 
 def analyze_document_structure(text_lines):
@@ -31,42 +259,68 @@ def analyze_document_structure(text_lines):
     문서 텍스트에서 구조 정보 추출 (장/조/항)
     
     Args:
-        text_lines: 문서 텍스트 줄 리스트
+        text_lines: 문서 텍스트 줄 리스트 또는 줄바꿈으로 구분된 전체 텍스트
     
     Returns:
         dict: {
             'chapters': [...],  # 장 정보
             'articles': [...],  # 조 정보
-            'structure_map': {...}  # 줄 번호 → 구조 정보 매핑
+            'structure_map': {...}  # 구조 줄 정보 (열 단위 병렬 배열, 같은 인덱스가 한 줄)
         }
+        
+        structure_map 열:
+            line_idx: 줄 번호 (array('i'))
+            type: 종류 코드 (bytearray, STRUCTURE_TYPES의 인덱스)
+            number: 장/조/항 번호 또는 호 글자
+            title: 장/조 제목 (항/호는 None)
+            article_num: 소속 조 번호 (장/조는 None)
+            chapter_num: 소속 장 번호 (장은 None)
     """
+    structure_map = {
+        'line_idx': array('i'),
+        'type': bytearray(),
+        'number': [],
+        'title': [],
+        'article_num': [],
+        'chapter_num': []
+    }
     structure = {
         'chapters': [],
         'articles': [],
-        'structure_map': {}  # line_idx -> structure_info
+        'structure_map': structure_map
     }
     
+    add_line = structure_map['line_idx'].append
+    add_type = structure_map['type'].append
+    add_number = structure_map['number'].append
+    add_title = structure_map['title'].append
+    add_article_num = structure_map['article_num'].append
+    add_chapter_num = structure_map['chapter_num'].append
+    
     current_chapter = None
     current_article = None
-    
-    # 정규식 패턴
-    patterns = {
-        'chapter': re.compile(r'^제\s*(\d+)\s*장\s+(.+)$'),  # 제1장 총칙
-        'article': re.compile(r'^제\s*(\d+)\s*조\s*(?:\((.+?)\))?(.*)$'),  # 제5조 (급여의 계산)
-        'paragraph': re.compile(r'^([①②③④⑤⑥⑦⑧⑨⑩]|\d+\))\s*(.*)$'),  # ① 내용, 1) 내용
-        'subparagraph': re.compile(r'^([가나다라마바사아자차카타파하])\.\s+(.*)$')  # 가. 내용
-    }
-    
-    for line_idx, line in enumerate(text_lines):
-        line = line.strip()
-        if not line:
-            continue
+    chapter_num = None
+    article_num = None
+    
+    # 줄 단위 Python 루프 대신 전체 텍스트에서 구조 줄만 찾고, 줄 번호는 앞 매치 이후의 줄바꿈 수로 계산
+    full_text = text_lines if isinstance(text_lines, str) else '\n'.join(text_lines)
+    # 장/조 표시('제')가 전혀 없는 문서(회의록, 보고서 등)는 장/조가 없으므로 정규식 검사를 생략
+    # (이 경우 소속 조가 없는 항/호 줄도 structure_map에 기록하지 않음)
+    if '제' not in full_text:
+        return structure
+    
+    line_idx = 0
+    pos = 0
+    for match in _STRUCTURE_LINE_RE.finditer(full_text):
+        start = match.start()
+        line_idx += full_text.count('\n', pos, start)
+        pos = start
+        kind = match.lastgroup
         
         # 장(Chapter) 감지
-        chapter_match = patterns['chapter'].match(line)
-        if chapter_match:
-            chapter_num = chapter_match.group(1)
-            chapter_title = chapter_match.group(2).strip()
+        if kind == 'chapter':
+            chapter_num = match.group('chapter_num')
+            chapter_title = match.group('chapter_title').strip()
             
             current_chapter = {
                 'number': chapter_num,
@@ -75,24 +329,18 @@ def analyze_document_structure(text_lines):
                 'articles': []
             }
             structure['chapters'].append(current_chapter)
-            structure['structure_map'][line_idx] = {
-                'type': 'chapter',
-                'number': chapter_num,
-                'title': chapter_title
-            }
-            continue
+            number, title, parent_article, parent_chapter = chapter_num, chapter_title, None, None
         
         # 조(Article) 감지
-        article_match = patterns['article'].match(line)
-        if article_match:
-            article_num = article_match.group(1)
-            article_title = article_match.group(2).strip() if article_match.group(2) else ''
+        elif kind == 'article':
+            article_num = match.group('article_num')
+            article_title = match.group('article_title').strip() if match.group('article_title') else ''
             
             current_article = {
                 'number': article_num,
                 'title': article_title,
                 'line_idx': line_idx,
-                'chapter_num': current_chapter['number'] if current_chapter else None,
+                'chapter_num': chapter_num,
                 'paragraphs': []
             }
             
@@ -100,83 +348,71 @@ def analyze_document_structure(text_lines):
                 current_chapter['articles'].append(current_article)
             
             structure['articles'].append(current_article)
-            structure['structure_map'][line_idx] = {
-                'type': 'article',
-                'number': article_num,
-                'title': article_title,
-                'chapter_num': current_chapter['number'] if current_chapter else None
-            }
-            continue
+            number, title, parent_article, parent_chapter = article_num, article_title, None, chapter_num
         
         # 항(Paragraph) 감지
-        para_match = patterns['paragraph'].match(line)
-        if para_match:
-            para_num = para_match.group(1)
+        elif kind == 'paragraph':
+            para_num = match.group('para_num')
             
             # 한글 숫자 변환
-            korean_numbers = {'①': '1', '②': '2', '③': '3', '④': '4', '⑤': '5',
-                            '⑥': '6', '⑦': '7', '⑧': '8', '⑨': '9', '⑩': '10'}
-            para_num_normalized = korean_numbers.get(para_num, para_num.rstrip(')'))
+            para_num_normalized = _CIRCLED_NUMBERS.get(para_num, para_num.rstrip(')'))
             
             if current_article:
                 current_article['paragraphs'].append({
                     'number': para_num_normalized,
                     'line_idx': line_idx
                 })
-            
-            structure['structure_map'][line_idx] = {
-                'type': 'paragraph',
-                'number': para_num_normalized,
-                'article_num': current_article['number'] if current_article else None,
-                'chapter_num': current_chapter['number'] if current_chapter else None
-            }
-            continue
+            number, title, parent_article, parent_chapter = para_num_normalized, None, article_num, chapter_num
         
         # 호(Subparagraph) 감지
-        subpara_match = patterns['subparagraph'].match(line)
-        if subpara_match:
-            subpara_letter = subpara_match.group(1)
-            
-            structure['structure_map'][line_idx] = {
-                'type': 'subparagraph',
-                'letter': subpara_letter,
-                'article_num': current_article['number'] if current_article else None,
-                'chapter_num': current_chapter['number'] if current_chapter else None
-            }
+        else:
+            number, title, parent_article, parent_chapter = match.group('subpara_letter'), None, article_num, chapter_num
+        
+        add_line(line_idx)
+        add_type(_STRUCTURE_TYPE_CODES[kind])
+        add_number(number)
+        add_title(title)
+        add_article_num(parent_article)
+        add_chapter_num(parent_chapter)
     
     return structure
 
 
-def build_hierarchy_path(structure_info):
+@dataclass(slots=True)
+class StructInfo:
+    """build_hierarchy_path 입력 (빈 문자열은 해당 단계 없음)"""
+    chapter_num: str = ''
+    chapter_title: str = ''
+    article_num: str = ''
+    article_title: str = ''
+    paragraph_num: str = ''
+
+
+def build_hierarchy_path(info):
     """
     구조 정보로부터 계층 경로 생성
     예: "제3장 급여의 지급 > 제15조 급여의 계산 > 제1항"
+    
+    Args:
+        info: StructInfo
     """
     parts = []
     
-    if structure_info.get('chapter_num'):
-        if structure_info.get('chapter_title'):
-            parts.append(f"제{structure_info['chapter_num']}장 {structure_info['chapter_title']}")
-        else:
-            parts.append(f"제{structure_info['chapter_num']}장")
+    if info.chapter_num:
+        parts.append(f"제{info.chapter_num}장 {info.chapter_title}" if info.chapter_title else f"제{info.chapter_num}장")
     
-    if structure_info.get('article_num'):
-        if structure_info.get('article_title'):
-            parts.append(f"제{structure_info['article_num']}조 {structure_info['article_title']}")
-        else:
-            parts.append(f"제{structure_info['article_num']}조")
+    if info.article_num:
+        parts.append(f"제{info.article_num}조 {info.article_title}" if info.article_title else f"제{info.article_num}조")
     
-    if structure_info.get('paragraph_num'):
-        parts.append(f"제{structure_info['paragraph_num']}항")
+    if info.paragraph_num:
+        parts.append(f"제{info.paragraph_num}항")
     
-    return " > ".join(parts) if parts else ""
+    return " > ".join(parts)
 
 
 def extract_hwpx_with_structure(hwpx_path, output_dir="extracted_data"):
     """HWPX 파일에서 구조화된 데이터 추출"""
     
-    os.makedirs(output_dir, exist_ok=True)
-    
     result = {
         "text_content": [],
         "tables": [],
@@ -188,87 +424,63 @@ def extract_hwpx_with_structure(hwpx_path, output_dir="extracted_data"):
     
     # HWPX는 ZIP 파일
     with zipfile.ZipFile(hwpx_path, 'r') as z:
+        # 섹션/이미지 항목을 한 번의 순회로 분류 (ZipInfo를 그대로 z.open에 전달)
+        section_infos = []
+        image_infos = []
+        for info in z.infolist():
+            name = info.filename
+            if name.startswith('Contents/section') and name.endswith('.xml'):
+                section_infos.append(info)
+            elif name.startswith('BinData/') and name.lower().endswith(_IMG_EXTS):
+                image_infos.append(info)
         
-        # 메타데이터 추출
+        # 메타데이터 추출 (header.xml 내용은 사용하지 않으므로 존재 여부만 확인)
         try:
-            header_xml = z.read('Contents/header.xml').decode('utf-8')
-            header_root = ET.fromstring(header_xml)
+            z.getinfo('Contents/header.xml')
             result["metadata"]["header"] = "추출됨"
-        except:
+        except KeyError:
             pass
         
-        # Section 파일들 처리
-        section_files = [f for f in z.namelist() if f.startswith('Contents/section') and f.endswith('.xml')]
-        
-        for section_file in section_files:
-            section_xml = z.read(section_file).decode('utf-8')
-            root = ET.fromstring(section_xml)
-            
-            # 네임스페이스 정의
-            ns = {
-                'hp': 'http://www.hancom.co.kr/hwpml/2011/paragraph',
-                'hc': 'http://www.hancom.co.kr/hwpml/2011/core'
-            }
-            
-            # 텍스트 추출 (단락별)
-            paragraphs = root.findall('.//hp:p', ns)
-            for i, para in enumerate(paragraphs):
-                para_text = ''.join(para.itertext()).strip()
-                if para_text:
-                    result["paragraphs"].append({
-                        "id": i,
-                        "text": para_text,
-                        "type": "paragraph"
-                    })
-                    result["text_content"].append(para_text)
-            
-            # 표(Table) 추출
-            tables = root.findall('.//hp:tbl', ns)
-            for t_idx, table in enumerate(tables):
-                table_data = {
-                    "id": t_idx,
-                    "type": "table",
-                    "rows": [],
-                    "summary": ""
-                }
-                
-                # 표의 각 행(tr) 처리
-                rows = table.findall('.//hp:tr', ns)
-                for row in rows:
-                    cells = []
-                    # 각 셀(tc) 처리
-                    for cell in row.findall('.//hp:tc', ns):
-                        cell_text = ''.join(cell.itertext()).strip()
-                        cells.append(cell_text)
-                    if cells:
-                        table_data["rows"].append(cells)
-                
-                if table_data["rows"]:
-                    # 표 요약 생성
-                    table_data["summary"] = f"표 {t_idx + 1}: {len(table_data['rows'])}행 × {len(table_data['rows'][0])}열"
-                    result["tables"].append(table_data)
-                    
-                    # 텍스트 컨텐츠에도 표시
-                    result["text_content"].append(f"\n[{table_data['summary']}]\n")
-        
-        # 이미지 추출
-        image_files = [f for f in z.namelist() if f.startswith('BinData/') and 
-                      any(f.endswith(ext) for ext in ['.jpg', '.jpeg', '.png', '.bmp', '.gif'])]
+        # Section 파일들 처리 (큰 문서는 섹션별로 프로세스 병렬 파싱)
+        workers = _section_workers(section_infos)
+        if workers > 1:
+            section_names = [section_info.filename for section_info in section_infos]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                sections = list(executor.map(_parse_section_entry, [hwpx_path] * len(section_names), section_names))
+        else:
+            sections = []
+            for section_info in section_infos:
+                with z.open(section_info) as fh:
+                    sections.append(_parse_section(fh))
+    
+    for para_texts, tables in sections:
+        # 단락 id는 빈 단락을 포함한 섹션 내 순번
+        result["paragraphs"].extend(
+            {"id": i, "text": text, "type": "paragraph"}
+            for i, text in enumerate(para_texts) if text
+        )
+        result["text_content"].extend(filter(None, para_texts))
         
-        for img_file in image_files:
-            img_data = z.read(img_file)
-            img_name = os.path.basename(img_file)
-            
-            # 이미지 파일 저장
-            img_path = os.path.join(output_dir, img_name)
-            with open(img_path, 'wb') as f:
-                f.write(img_data)
-            
-            result["images"].append({
-                "filename": img_name,
-                "path": img_path,
-                "size": len(img_data)
-            })
+        # 표 요약은 텍스트 컨텐츠에도 표시 (섹션의 단락 뒤에)
+        result["tables"].extend(tables)
+        result["text_content"].extend(f"\n[{table['summary']}]\n" for table in tables)
+    
+    # 이미지 추출 (워커별로 연속 구간을 맡겨 결과 순서 유지)
+    # 출력 폴더는 이미지가 있을 때만 여기서 만들고, 그 외에는 save_results에서 생성
+    if image_infos:
+        os.makedirs(output_dir, exist_ok=True)
+    workers = min(IMAGE_WORKERS, len(image_infos))
+    if workers > 1:
+        step = -(-len(image_infos) // workers)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hwpx-image") as executor:
+            parts = executor.map(
+                lambda start: _extract_images(hwpx_path, image_infos[start:start + step], output_dir),
+                range(0, len(image_infos), step)
+            )
+            for images in parts:
+                result["images"].extend(images)
+    elif image_infos:
+        result["images"].extend(_extract_images(hwpx_path, image_infos, output_dir))
     
     return result
 
@@ -333,40 +545,39 @@ def save_results(result, output_dir="extracted_data"):
     # 출력 디렉토리 생성
     os.makedirs(output_dir, exist_ok=True)
     
-    base_name = Path(output_dir).stem
+    # 결과 파일 경로 접두부 (폴더/폴더명)
+    prefix = os.path.join(output_dir, Path(output_dir).stem)
+    text_content = result["text_content"]
+    total_chars = sum(map(len, text_content))
     
-    # 1. 전체 텍스트 저장
-    text_file = os.path.join(output_dir, f"{base_name}_전체텍스트.txt")
-    with open(text_file, 'w', encoding='utf-8') as f:
-        f.write('\n\n'.join(result["text_content"]))
+    # 1. 전체 텍스트 저장 (전체를 이어 붙인 문자열을 만들지 않고 단락 사이에 빈 줄을 넣어 기록)
+    text_file = f"{prefix}_전체텍스트.txt"
+    _write_text(text_file, (text if i == 0 else f"\n\n{text}" for i, text in enumerate(text_content)))
     
     # 2. 표 데이터 저장 (HWPX만)
     table_json = None
     table_txt = None
     if result["tables"]:
-        table_json = os.path.join(output_dir, f"{base_name}_표데이터.json")
-        with open(table_json, 'w', encoding='utf-8') as f:
-            json.dump(result["tables"], f, ensure_ascii=False, indent=2)
+        table_json = f"{prefix}_표데이터.json"
+        _dump_json(result["tables"], table_json)
         
         # 표 데이터를 읽기 쉬운 텍스트로도 저장
-        table_txt = os.path.join(output_dir, f"{base_name}_표목록.txt")
-        with open(table_txt, 'w', encoding='utf-8') as f:
-            for table in result["tables"]:
-                f.write(f"\n{'='*60}\n")
-                f.write(f"{table['summary']}\n")
-                f.write(f"{'='*60}\n\n")
-                for row in table["rows"]:
-                    f.write(" | ".join(row) + "\n")
-                f.write("\n")
+        table_txt = f"{prefix}_표목록.txt"
+        rule = '=' * 60
+        # 행 텍스트는 map(str.join)으로 C 레벨에서 이어 붙임 (저장되는 표는 항상 행이 있음)
+        _write_text(table_txt, (
+            f"\n{rule}\n{table['summary']}\n{rule}\n\n"
+            + '\n'.join(map(' | '.join, table["rows"]))
+            + "\n\n"
+            for table in result["tables"]
+        ))
     
     # 3. 문서 구조 분석 및 저장
-    # 전체 텍스트를 줄 단위로 분리하여 구조 분석
-    full_text = '\n\n'.join(result["text_content"])
-    text_lines = full_text.split('\n')
-    doc_structure = analyze_document_structure(text_lines)
+    # 전체 텍스트(단락 사이 빈 줄)를 한 번만 만들어 줄 리스트로 나누지 않고 그대로 구조 분석
+    doc_structure = analyze_document_structure('\n\n'.join(text_content))
     
     # 구조 정보 저장
-    structure_json = os.path.join(output_dir, f"{base_name}_구조.json")
+    structure_json = f"{prefix}_구조.json"
     save_result = {
         "file_type": result["file_type"],
         "text_paragraphs": result["paragraphs"],
@@ -382,53 +593,54 @@ def save_results(result, output_dir="extracted_data"):
             "total_articles": len(doc_structure['articles'])
         }
     }
-    with open(structure_json, 'w', encoding='utf-8') as f:
-        json.dump(save_result, f, ensure_ascii=False, indent=2)
+    _dump_json(save_result, structure_json)
     
     # 4. 요약 리포트 생성
-    report_file = os.path.join(output_dir, f"{base_name}_추출요약.txt")
-    with open(report_file, 'w', encoding='utf-8') as f:
-        f.write("=" * 60 + "\n")
-        f.write(f"{result['file_type']} 파일 추출 요약 리포트\n")
-        f.write("=" * 60 + "\n\n")
-        f.write(f"파일 형식: {result['file_type']}\n")
-        f.write(f"전체 텍스트 길이: {len(''.join(result['text_content']))} 글자\n")
-        f.write(f"단락 수: {len(result['paragraphs'])}개\n")
-        f.write(f"표 개수: {len(result['tables'])}개\n")
-        f.write(f"이미지 개수: {len(result['images'])}개\n\n")
-        
+    report_file = f"{prefix}_추출요약.txt"
+    lines = [
+        "=" * 60,
+        f"{result['file_type']} 파일 추출 요약 리포트",
+        "=" * 60,
+        "",
+        f"파일 형식: {result['file_type']}",
+        f"전체 텍스트 길이: {total_chars} 글자",
+        f"단락 수: {len(result['paragraphs'])}개",
+        f"표 개수: {len(result['tables'])}개",
+        f"이미지 개수: {len(result['images'])}개",
+        "",
         # 문서 구조 정보 추가
-        f.write(f"[문서 구조 정보]\n")
-        f.write(f"장(Chapter) 수: {len(doc_structure['chapters'])}개\n")
-        f.write(f"조(Article) 수: {len(doc_structure['articles'])}개\n")
-        
-        if doc_structure['chapters']:
-            f.write(f"\n[장 목록]\n")
-            for ch in doc_structure['chapters']:
-                f.write(f"  제{ch['number']}장: {ch['title']}\n")
-        
-        if doc_structure['articles']:
-            f.write(f"\n[조 목록 (일부)]\n")
-            for art in doc_structure['articles'][:10]:  # 처음 10개만
-                title = f"({art['title']})" if art['title'] else ""
-                f.write(f"  제{art['number']}조 {title}\n")
-            if len(doc_structure['articles']) > 10:
-                f.write(f"  ... 외 {len(doc_structure['articles']) - 10}개\n")
-        f.write("\n")
-        
-        if result["file_type"] == "HWP":
-            f.write("[참고] HWP 파일은 텍스트만 추출됩니다.\n")
-            f.write("표, 이미지 등이 필요하면 한글 프로그램에서 HWPX로 저장하세요.\n")
-        
-        if result["tables"]:
-            f.write("\n[표 목록]\n")
-            for table in result["tables"]:
-                f.write(f"  - {table['summary']}\n")
-        
-        if result["images"]:
-            f.write("\n[이미지 목록]\n")
-            for img in result["images"]:
-                f.write(f"  - {img['filename']} ({img['size']:,} bytes)\n")
+        "[문서 구조 정보]",
+        f"장(Chapter) 수: {len(doc_structure['chapters'])}개",
+        f"조(Article) 수: {len(doc_structure['articles'])}개",
+    ]
+    
+    if doc_structure['chapters']:
+        lines.append("\n[장 목록]")
+        lines.extend(f"  제{ch['number']}장: {ch['title']}" for ch in doc_structure['chapters'])
+    
+    if doc_structure['articles']:
+        lines.append("\n[조 목록 (일부)]")
+        for art in doc_structure['articles'][:10]:  # 처음 10개만
+            title = f"({art['title']})" if art['title'] else ""
+            lines.append(f"  제{art['number']}조 {title}")
+        if len(doc_structure['articles']) > 10:
+            lines.append(f"  ... 외 {len(doc_structure['articles']) - 10}개")
+    lines.append("")
+    
+    if result["file_type"] == "HWP":
+        lines.append("[참고] HWP 파일은 텍스트만 추출됩니다.")
+        lines.append("표, 이미지 등이 필요하면 한글 프로그램에서 HWPX로 저장하세요.")
+    
+    if result["tables"]:
+        lines.append("\n[표 목록]")
+        lines.extend(f"  - {table['summary']}" for table in result["tables"])
+    
+    if result["images"]:
+        lines.append("\n[이미지 목록]")
+        lines.extend(f"  - {img['filename']} ({img['size']:,} bytes)" for img in result["images"])
+    
+    # 리포트는 한 번에 기록
+    _write_text(report_file, ["\n".join(lines) + "\n"])
     
     return {
         "text_file": text_file,
@@ -436,21 +648,29 @@ def save_results(result, output_dir="extracted_data"):
         "table_txt": table_txt,
         "structure_json": structure_json,
         "report_file": report_file,
-        "output_dir": output_dir
+        "output_dir": output_dir,
+        "total_chars": total_chars,
+        # 출력용 파일 이름 (생성 순서)
+        "file_names": [
+            os.path.basename(path)
+            for path in (text_file, table_json, table_txt, structure_json, report_file)
+            if path
+        ]
     }
 
 
 def process_single_file(file_path):
     """단일 파일 처리"""
     # 파일 확장자 확인
-    file_ext = Path(file_path).suffix.lower()
+    path = Path(file_path)
+    file_ext = path.suffix.lower()
     
     if file_ext not in ['.hwp', '.hwpx']:
         print(f"[건너뜀] 지원하지 않는 형식: {file_path}")
         return None
     
     # 출력 디렉토리 이름 생성
-    base_name = Path(file_path).stem
+    base_name = path.stem
     output_dir = os.path.join("extracted_results", f"extracted_{base_name}")
     
     print(f"[파일] {file_path}")
@@ -487,18 +707,14 @@ def process_single_file(file_path):
         print(f"단락 수: {len(result['paragraphs'])}개")
         print(f"표 개수: {len(result['tables'])}개")
         print(f"이미지 개수: {len(result['images'])}개")
-        print(f"전체 텍스트: {len(''.join(result['text_content']))} 글자\n")
+        print(f"전체 텍스트: {files['total_chars']} 글자\n")
         
         print("=" * 60)
         print("생성된 파일")
         print("=" * 60)
         print(f"출력 폴더: {os.path.abspath(output_dir)}\n")
-        print(f"  - {os.path.basename(files['text_file'])}")
-        if files['table_json']:
-            print(f"  - {os.path.basename(files['table_json'])}")
-            print(f"  - {os.path.basename(files['table_txt'])}")
-        print(f"  - {os.path.basename(files['structure_json'])}")
-        print(f"  - {os.path.basename(files['report_file'])}")
+        for file_name in files['file_names']:
+            print(f"  - {file_name}")
         
         if result['images']:
             print(f"\n  이미지 파일들:")
@@ -518,12 +734,42 @@ def process_single_file(file_path):
         return None
 
 
+def _process_hwpx_file(file_path):
+    """process_single_file 실행 후 성공 여부만 반환 (프로세스 풀에서 결과 전체를 돌려받지 않도록)"""
+    return process_single_file(file_path) is not None
+
+
+def run_hwp_worker():
+    """
+    HWP 일괄 처리 워커 (process_folder가 --hwp-worker로 실행)
+    
+    표준 입력의 HWP 파일 경로들을 한 프로세스(JVM 1회 시작)에서 순서대로 처리하고,
+    파일마다 "HWP_RESULT_PREFIX OK|FAIL 경로" 줄을 출력
+    """
+    if hasattr(sys.stdin, 'reconfigure'):
+        sys.stdin.reconfigure(encoding='utf-8')
+    paths = [line.strip() for line in sys.stdin if line.strip()]
+    
+    for path in paths:
+        ok = process_single_file(path) is not None
+        print(f"{HWP_RESULT_PREFIX} {'OK' if ok else 'FAIL'} {path}", flush=True)
+
+
 def process_folder(folder_path):
     """폴더 내 모든 HWP/HWPX 파일 일괄 처리"""
     # 폴더 내 모든 HWP/HWPX 파일 검색
-    folder = Path(folder_path)
-    hwp_files = list(folder.glob("*.hwp"))
-    hwpx_files = list(folder.glob("*.hwpx"))
+    # (디렉토리를 한 번만 읽어 확장자별로 분류)
+    hwp_files = []
+    hwpx_files = []
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            name = entry.name.lower()
+            if name.endswith('.hwpx'):
+                hwpx_files.append(Path(entry.path))
+            elif name.endswith('.hwp'):
+                hwp_files.append(Path(entry.path))
     all_files = hwp_files + hwpx_files
     
     if not all_files:
@@ -545,25 +791,31 @@ def process_folder(folder_path):
         "failed": []
     }
     
-    # HWPX 파일과 HWP 파일 분리
-    hwpx_files = [f for f in all_files if f.suffix.lower() == '.hwpx']
-    hwp_files = [f for f in all_files if f.suffix.lower() == '.hwp']
-    
-    # HWPX 파일 먼저 처리 (같은 프로세스에서 가능)
-    print("\n[Phase 1] HWPX 파일 처리 (같은 프로세스)")
+    # HWPX 파일 먼저 처리 (JVM이 필요 없으므로 코어 절반까지 프로세스 병렬 처리)
+    workers = min(len(hwpx_files), max(1, (os.cpu_count() or 1) // 2))
+    print(f"\n[Phase 1] HWPX 파일 처리 (프로세스 {workers}개)")
     print("=" * 70)
     
-    for idx, file_path in enumerate(hwpx_files, 1):
-        print(f"\n진행: {idx}/{len(hwpx_files)}")
-        result = process_single_file(str(file_path))
-        
-        if result:
-            results["success"].append(file_path.name)
-        else:
-            results["failed"].append(file_path.name)
-    
-    # HWP 파일은 각각 새 프로세스에서 처리 (JVM 제약 때문)
-    print("\n\n[Phase 2] HWP 파일 처리 (각 파일마다 새 프로세스)")
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(_process_hwpx_file, str(file_path)): file_path for file_path in hwpx_files}
+            for idx, future in enumerate(as_completed(futures), 1):
+                file_path = futures[future]
+                print(f"\n진행: {idx}/{len(hwpx_files)} ({file_path.name})")
+                if future.result():
+                    results["success"].append(file_path.name)
+                else:
+                    results["failed"].append(file_path.name)
+    else:
+        for idx, file_path in enumerate(hwpx_files, 1):
+            print(f"\n진행: {idx}/{len(hwpx_files)}")
+            if _process_hwpx_file(str(file_path)):
+                results["success"].append(file_path.name)
+            else:
+                results["failed"].append(file_path.name)
+    
+    # HWP 파일은 별도 프로세스 하나에서 처리 (JVM 제약 때문, JVM은 한 번만 시작해 모든 파일에 재사용)
+    print("\n\n[Phase 2] HWP 파일 처리 (별도 프로세스 1개, JVM 1회 시작)")
     print("=" * 70)
     
     import subprocess
@@ -577,26 +829,45 @@ def process_folder(folder_path):
         print(f"\n[경고] JAVA_HOME 자동 설정 실패: {e}")
         print("수동으로 설정 필요: export JAVA_HOME=/usr/lib/jvm/java-11-openjdk-amd64\n")
     
-    for idx, file_path in enumerate(hwp_files, 1):
-        print(f"\n진행: {idx}/{len(hwp_files)}")
-        print(f"[파일] {file_path}")
-        
-        # 새 Python 프로세스에서 HWP 파일 처리
+    if hwp_files:
+        # 새 Python 프로세스를 --hwp-worker 모드로 실행하고 표준 입력으로 파일 목록 전달
         # 부모 프로세스의 환경변수(JAVA_HOME 포함)를 자식 프로세스로 전달
         script_path = os.path.abspath(__file__)
         env = os.environ.copy()  # 부모 환경변수 복사
         
-        result_code = subprocess.call(
-            [sys.executable, script_path, str(file_path)],
+        proc = subprocess.Popen(
+            [sys.executable, script_path, HWP_WORKER_FLAG],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            encoding='utf-8',
             env=env  # 환경변수 명시적 전달
         )
+        proc.stdin.write(''.join(f"{file_path}\n" for file_path in hwp_files))
+        proc.stdin.close()
         
-        if result_code == 0:
-            results["success"].append(file_path.name)
-            print(f"[완료] {file_path.name}")
-        else:
-            results["failed"].append(file_path.name)
-            print(f"[실패] {file_path.name}")
+        # 워커 출력은 그대로 전달하고, 결과 줄로 파일별 성공 여부 집계
+        done = set()
+        for line in proc.stdout:
+            if not line.startswith(HWP_RESULT_PREFIX):
+                print(line, end='')
+                continue
+            _, status, path = line.rstrip('\n').split(' ', 2)
+            name = Path(path).name
+            done.add(path)
+            print(f"\n진행: {len(done)}/{len(hwp_files)}")
+            if status == 'OK':
+                results["success"].append(name)
+                print(f"[완료] {name}")
+            else:
+                results["failed"].append(name)
+                print(f"[실패] {name}")
+        proc.wait()
+        
+        # 워커가 비정상 종료해 결과를 받지 못한 파일은 실패 처리
+        for file_path in hwp_files:
+            if str(file_path) not in done:
+                results["failed"].append(file_path.name)
+                print(f"[실패] {file_path.name} (워커 종료 코드: {proc.returncode})")
     
     # 최종 요약
     print("\n" + "=" * 70)
@@ -631,6 +902,10 @@ def main():
     
     target_path = sys.argv[1]
     
+    if target_path == HWP_WORKER_FLAG:
+        run_hwp_worker()
+        return
+    
     if not os.path.exists(target_path):
         print(f"[오류] 경로를 찾을 수 없습니다: {target_path}")
         sys.exit(1)
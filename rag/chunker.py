@@ -8,6 +8,11 @@ from loguru import logger
 import re
 
 
+# 장/조 패턴 (청크마다 호출되는 _find_structure_context에서 재사용하도록 모듈 로드 시 컴파일)
+_CHAPTER_PATTERN = re.compile(r'제\s*(\d+)\s*장\s+(.+)')
+_ARTICLE_PATTERN = re.compile(r'제\s*(\d+)\s*조\s*(?:\((.+?)\))?')
+
+
 class DocumentChunker:
     """문서 청킹 클래스"""
     
@@ -33,9 +38,35 @@ class DocumentChunker:
             separators=self.separators,
             length_function=len,
         )
+        self._native_splitter = self._load_native_splitter() if config.TEXT_SPLITTER == "native" else None
         
         logger.info(f"DocumentChunker 초기화: chunk_size={chunk_size}, overlap={chunk_overlap}")
     
+    def _load_native_splitter(self):
+        """
+        semantic-text-splitter(Rust 구현) 분할기 생성
+        
+        유니코드 문장/단어 경계 기준으로 분할하며 separators는 사용하지 않음
+        
+        Returns:
+            TextSplitter (패키지 미설치 시 None - LangChain 분할기 사용)
+        """
+        try:
+            from semantic_text_splitter import TextSplitter
+        except ImportError as e:
+            logger.warning(f"semantic-text-splitter 사용 불가, LangChain 분할기 사용: {e}")
+            return None
+        return TextSplitter(self.chunk_size, overlap=self.chunk_overlap)
+    
+    def _split(self, text: str, metadata: Dict) -> List[Document]:
+        """텍스트를 청크 Document 리스트로 분할 (메타데이터는 청크별 복사본)"""
+        if self._native_splitter is None:
+            return self.text_splitter.create_documents(texts=[text], metadatas=[metadata])
+        return [
+            Document(page_content=chunk, metadata=metadata.copy())
+            for chunk in self._native_splitter.chunks(text)
+        ]
+    
     def _find_structure_context(self, text: str, chunk_start: int, chunk_end: int) -> Dict:
         """
         청크의 위치를 기반으로 해당 청크가 속한 문서 구조 찾기
@@ -51,10 +82,6 @@ class DocumentChunker:
         # 청크 앞부분의 텍스트에서 가장 가까운 장/조 찾기
         text_before = text[:chunk_start]
         
-        # 패턴 정의
-        chapter_pattern = re.compile(r'제\s*(\d+)\s*장\s+(.+)')
-        article_pattern = re.compile(r'제\s*(\d+)\s*조\s*(?:\((.+?)\))?')
-        
         # 역순으로 검색 (가장 가까운 것 찾기)
         lines_before = text_before.split('\n')
         
@@ -69,14 +96,14 @@ class DocumentChunker:
             
             # 조 찾기
             if current_article is None:
-                article_match = article_pattern.search(line)
+                article_match = _ARTICLE_PATTERN.search(line)
                 if article_match:
                     current_article = article_match.group(1)
                     current_article_title = article_match.group(2) if article_match.group(2) else ""
             
             # 장 찾기
             if current_chapter is None:
-                chapter_match = chapter_pattern.search(line)
+                chapter_match = _CHAPTER_PATTERN.search(line)
                 if chapter_match:
                     current_chapter = chapter_match.group(1)
                     current_chapter_title = chapter_match.group(2).strip()
@@ -131,10 +158,7 @@ class DocumentChunker:
             metadata = {}
         
         # 청크 생성
-        chunks = self.text_splitter.create_documents(
-            texts=[text],
-            metadatas=[metadata]
-        )
+        chunks = self._split(text, metadata)
         
         # 각 청크에 구조 메타데이터 추가
         current_pos = 0
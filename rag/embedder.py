@@ -3,6 +3,7 @@
 BGE-M3 모델을 사용한 텍스트 임베딩
 """
 
+import os
 from typing import List, Union
 import numpy as np
 from sentence_transformers import SentenceTransformer
@@ -17,23 +18,29 @@ class DocumentEmbedder:
     def __init__(
         self,
         model_name: str = config.EMBEDDING_MODEL,
-        device: str = "cuda"  # "cuda" 또는 "cpu"
+        device: str = "cuda",  # "cuda" 또는 "cpu"
+        backend: str = config.EMBEDDING_BACKEND,  # "torch" 또는 "onnx"
+        precision: str = config.EMBED_PRECISION  # "fp32" 또는 "int8"
     ):
         """
         Args:
             model_name: 임베딩 모델 이름
             device: 실행 디바이스
+            backend: 추론 백엔드 (onnx 사용 시 ONNX Runtime으로 실행)
+            precision: 가중치 정밀도 (int8은 onnx 백엔드의 CPU 실행에서만 사용)
         """
         self.model_name = model_name
         self.device = device
+        self.backend = backend
+        self.precision = precision
         
-        logger.info(f"임베딩 모델 로딩 중: {model_name}")
+        logger.info(f"임베딩 모델 로딩 중: {model_name} (backend: {backend}, precision: {precision})")
         try:
-            self.model = SentenceTransformer(model_name, device=device)
+            self.model = self._load_model(device)
             logger.info(f"임베딩 모델 로드 완료: {model_name} (device: {device})")
         except Exception as e:
             logger.warning(f"GPU 로딩 실패, CPU로 전환: {e}")
-            self.model = SentenceTransformer(model_name, device="cpu")
+            self.model = self._load_model("cpu")
             self.device = "cpu"
             logger.info(f"임베딩 모델 로드 완료: {model_name} (device: cpu)")
         
@@ -41,6 +48,96 @@ class DocumentEmbedder:
         self.embedding_dim = self.model.get_sentence_embedding_dimension()
         logger.info(f"임베딩 차원: {self.embedding_dim}")
     
+    def _load_model(self, device: str) -> SentenceTransformer:
+        """
+        백엔드 설정에 맞게 SentenceTransformer 로드
+        
+        onnx 백엔드는 첫 로드 시 ONNX로 export됨 (세션 설정은 _onnx_model_kwargs 참고)
+        
+        Args:
+            device: 실행 디바이스
+        
+        Returns:
+            SentenceTransformer 모델
+        """
+        if self.backend == "onnx" and self.precision == "int8" and device == "cpu":
+            return self._load_int8_model()
+        if self.backend == "onnx":
+            return SentenceTransformer(
+                self.model_name,
+                device=device,
+                backend="onnx",
+                model_kwargs=self._onnx_model_kwargs(device)
+            )
+        return SentenceTransformer(self.model_name, device=device)
+    
+    def _load_int8_model(self) -> SentenceTransformer:
+        """
+        동적 INT8 양자화된 ONNX 모델 로드 (CPU 전용)
+        
+        양자화 모델이 없으면 FP32 ONNX 모델을 export 후 양자화하여
+        config.MODELS_DIR에 저장하고, 이후에는 저장된 모델을 바로 로드
+        
+        Returns:
+            SentenceTransformer 모델
+        """
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+        
+        save_dir = config.MODELS_DIR / self.model_name.replace("/", "__")
+        file_name = f"onnx/model_qint8_{config.EMBED_QUANT_CONFIG}.onnx"
+        
+        if not (save_dir / file_name).exists():
+            logger.info(f"INT8 양자화 모델 생성 중: {save_dir}")
+            fp32_model = SentenceTransformer(
+                self.model_name,
+                device="cpu",
+                backend="onnx",
+                model_kwargs={"provider": "CPUExecutionProvider"}
+            )
+            fp32_model.save(str(save_dir))
+            export_dynamic_quantized_onnx_model(
+                fp32_model,
+                quantization_config=config.EMBED_QUANT_CONFIG,
+                model_name_or_path=str(save_dir)
+            )
+        
+        return SentenceTransformer(
+            str(save_dir),
+            device="cpu",
+            backend="onnx",
+            model_kwargs={**self._onnx_model_kwargs("cpu"), "file_name": file_name}
+        )
+    
+    @staticmethod
+    def _onnx_model_kwargs(device: str) -> dict:
+        """
+        ONNX Runtime 세션 설정
+        
+        CUDA: 세션 하나가 스레드를 모두 점유하지 않도록 intra_op 스레드를 1로 두고,
+        배치를 서브 배치로 나눠 여러 Run을 동시에 호출하는 방식으로 GPU 활용도를 높임.
+        CPU: 단일 쿼리 임베딩 지연이 늘지 않도록 ONNX Runtime 기본 intra_op 스레드 사용
+        
+        Args:
+            device: 실행 디바이스
+        
+        Returns:
+            SentenceTransformer model_kwargs
+        """
+        if device != "cuda":
+            return {"provider": "CPUExecutionProvider"}
+        
+        import onnxruntime as ort
+        
+        session_options = ort.SessionOptions()
+        session_options.intra_op_num_threads = 1
+        session_options.inter_op_num_threads = os.cpu_count() or 1
+        session_options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+        return {
+            "provider": "CUDAExecutionProvider",
+            "provider_options": {"device_id": 0, "cudnn_conv_algo_search": "HEURISTIC"},
+            "session_options": session_options
+        }
+    
     def embed_text(self, text: str) -> np.ndarray:
         """
         단일 텍스트 임베딩
@@ -3,7 +3,8 @@ RAG 파이프라인
 전체 시스템 통합 및 질의응답 처리
 """
 
-from typing import List, Dict
+from contextlib import nullcontext
+from typing import List, Dict, Optional
 from pathlib import Path
 import json
 from langchain_core.documents import Document
@@ -73,13 +74,19 @@ class RAGPipeline:
     
     def add_document_from_extract(
         self,
-        extracted_dir: Path
+        extracted_dir: Path,
+        user_metadata: Optional[Dict] = None,
+        index_lock=None
     ):
         """
         extract.py로 추출된 문서를 RAG 시스템에 추가
         
         Args:
             extracted_dir: 추출된 결과 디렉토리 (extracted_results/extracted_문서명/)
+            user_metadata: 사용자 메타데이터 (user_id, dept_id, project_id, category, upload_date 등,
+                모든 청크 메타데이터에 반영됨)
+            index_lock: 청킹/임베딩/저장 단계를 감쌀 lock (여러 스레드가 파이프라인을 공유할 때,
+                파일 읽기와 요약 생성은 lock 밖에서 동시에 실행됨)
         """
         extracted_dir = Path(extracted_dir)
         
@@ -109,7 +116,7 @@ class RAGPipeline:
             'doc_id': f"doc_{doc_name}",  # 문서 고유 ID
             'source': str(extracted_dir),
             'file_type': 'unknown',
-            # 사용자 입력 메타데이터 (추후 프론트엔드에서 전달받을 예정)
+            # 사용자 입력 메타데이터 (user_metadata로 전달)
             'user_id': '',
             'dept_id': '',
             'project_id': '',
@@ -119,8 +126,10 @@ class RAGPipeline:
             # 문서 관리 정보
             'category': '',
             'version': '',
-            'upload_date': ''
+            'upload_date': 0  # epoch ms
         }
+        if user_metadata:
+            metadata.update(user_metadata)
         
         # 구조 파일이 있으면 추가 정보 로드
         if structure_file:
@@ -153,33 +162,37 @@ class RAGPipeline:
             logger.warning(f"요약 생성 실패: {e}")
             metadata['summary'] = ""
         
-        # 청킹
-        if self.use_structure_chunking:
-            # 구조 우선 청킹
-            chunks = self.chunker.chunk_by_structure(text, metadata)
-        else:
-            # 일반 청킹
-            if tables:
-                chunks = self.chunker.chunk_with_tables(text, tables, metadata)
+        with index_lock or nullcontext():
+            # 청킹
+            if self.use_structure_chunking:
+                # 구조 우선 청킹
+                chunks = self.chunker.chunk_by_structure(text, metadata)
             else:
-                chunks = self.chunker.chunk_text(text, metadata)
-        
-        # 임베딩
-        embeddings = self.embedder.embed_documents(chunks)
-        
-        # 벡터 저장소에 추가
-        self.vector_store.add_documents(chunks, embeddings)
-        
-        # 저장 (Chroma는 자동으로 저장됨)
-        self.vector_store.save()
+                # 일반 청킹
+                if tables:
+                    chunks = self.chunker.chunk_with_tables(text, tables, metadata)
+                else:
+                    chunks = self.chunker.chunk_text(text, metadata)
+            
+            # 임베딩
+            embeddings = self.embedder.embed_documents(chunks)
+            
+            # 벡터 저장소에 추가
+            self.vector_store.add_documents(chunks, embeddings)
+            
+            # 저장 (Chroma는 자동으로 저장됨)
+            self.vector_store.save()
         
         logger.info(f"문서 추가 완료: {len(chunks)}개 청크")
         
         # 결과 반환
         return {
             'chunks_added': len(chunks),
+            'doc_id': metadata['doc_id'],
             'doc_name': metadata['doc_name'],
-            'file_type': metadata.get('file_type', 'unknown')
+            'file_type': metadata.get('file_type', 'unknown'),
+            'summary': metadata['summary'],
+            'metadata': metadata
         }
     
     def add_documents_batch(
@@ -216,7 +229,8 @@ class RAGPipeline:
         self,
         question: str,
         top_k: int = config.TOP_K,
-        return_sources: bool = True
+        return_sources: bool = True,
+        filters: Optional[Dict] = None
     ) -> Dict:
         """
         질문에 대한 답변 생성
@@ -225,6 +239,7 @@ class RAGPipeline:
             question: 사용자 질문
             top_k: 검색할 문서 수
             return_sources: 출처 반환 여부
+            filters: ChromaDB where 필터 (메타데이터 사전필터링, 없으면 전체 검색)
         
         Returns:
             {
@@ -245,7 +260,11 @@ class RAGPipeline:
         # 2. 유사 문서 검색
         # Reranker 사용 시 더 많은 후보 검색
         initial_top_k = config.RERANK_TOP_K if self.reranker else top_k
-        search_results = self.vector_store.search(query_embedding, top_k=initial_top_k)
+        search_results = self.vector_store.search(
+            query_embedding,
+            top_k=initial_top_k,
+            where_filter=filters
+        )
         
         if not search_results:
             logger.warning("검색 결과 없음")
@@ -3,9 +3,11 @@
 Chroma를 사용한 벡터 인덱싱 및 검색
 """
 
+import threading
 from typing import List, Tuple, Dict, Optional
 import numpy as np
 import chromadb
+from chromadb.errors import ChromaError
 from pathlib import Path
 from langchain_core.documents import Document
 import config
@@ -26,18 +28,30 @@ class VectorStore:
             persist_dir: 데이터 저장 디렉토리
         """
         self.embedding_dim = embedding_dim
-        self.persist_dir = Path(persist_dir)
-        self.persist_dir.mkdir(parents=True, exist_ok=True)
+        self.persist_dir = config.ensure_dir(Path(persist_dir))
+        
+        # 여러 스레드에서 동시에 추가할 때 ID 생성(count)과 add를 원자적으로 처리
+        self._write_lock = threading.Lock()
         
         # Chroma 클라이언트 초기화 (새로운 API)
         # PersistentClient: 로컬 저장소를 사용하는 클라이언트
         self.client = chromadb.PersistentClient(path=str(self.persist_dir))
         
         # 컬렉션 초기화 (기존에 있으면 로드, 없으면 생성)
-        self.collection = self.client.get_or_create_collection(
-            name="documents",
-            metadata={"hnsw:space": "l2"}  # L2 거리 사용 (FAISS와 동일)
-        )
+        # HNSW 파라미터는 생성 시점에만 지정 가능하므로 기존 컬렉션은 설정 없이 그대로 로드
+        # (기존 저장소는 생성 당시 배치 크기/동기화 주기를 유지, 새 값을 쓰려면 저장소 재구축 필요)
+        try:
+            self.collection = self.client.get_collection(name="documents")
+        except (ValueError, ChromaError):
+            # 문서 단위 일괄 추가 시 인덱스 갱신/디스크 동기화 횟수를 줄이도록 HNSW 배치 크기 확대
+            self.collection = self.client.get_or_create_collection(
+                name="documents",
+                metadata={
+                    "hnsw:space": "l2",  # L2 거리 사용 (FAISS와 동일)
+                    "hnsw:batch_size": config.HNSW_BATCH_SIZE,
+                    "hnsw:sync_threshold": config.HNSW_SYNC_THRESHOLD
+                }
+            )
         
         logger.info(f"Chroma VectorStore 초기화: dir={self.persist_dir}, dim={embedding_dim}")
         logger.info(f"컬렉션 크기: {self.collection.count()}개 문서")
@@ -61,32 +75,57 @@ class VectorStore:
             logger.warning("추가할 문서가 없습니다")
             return
         
-        # Chroma에 추가할 데이터 준비
-        ids = []
-        metadatas = []
-        documents_text = []
-        embeddings_list = []
-        
-        # 현재 컬렉션 크기를 기반으로 ID 생성
-        start_id = self.collection.count()
+        # Chroma에 추가할 데이터 준비 (임베딩은 행 단위 변환 대신 한 번에 변환)
+        documents_text = [doc.page_content for doc in documents]
+        metadatas = [doc.metadata if doc.metadata else {} for doc in documents]
+        embeddings_list = np.asarray(embeddings, dtype=np.float32).tolist()
         
-        for i, doc in enumerate(documents):
-            doc_id = f"doc_{start_id + i}"
-            ids.append(doc_id)
-            documents_text.append(doc.page_content)
-            metadatas.append(doc.metadata if doc.metadata else {})
-            embeddings_list.append(embeddings[i].tolist())  # numpy array → list
-        
-        # Chroma 컬렉션에 추가
-        self.collection.add(
-            ids=ids,
-            embeddings=embeddings_list,
-            documents=documents_text,
-            metadatas=metadatas
-        )
+        with self._write_lock:
+            # 현재 컬렉션 크기를 기반으로 ID 생성
+            start_id = self.collection.count()
+            ids = [f"doc_{start_id + i}" for i in range(len(documents))]
+            
+            # 문서 단위로 한 번에 추가 (클라이언트 최대 배치 크기 단위로 분할)
+            batch_size = self.client.get_max_batch_size()
+            for start in range(0, len(ids), batch_size):
+                end = start + batch_size
+                self._add_batch(
+                    ids[start:end],
+                    embeddings_list[start:end],
+                    documents_text[start:end],
+                    metadatas[start:end]
+                )
         
         logger.info(f"문서 추가 완료: {len(documents)}개 (총 {self.collection.count()}개)")
     
+    def _add_batch(
+        self,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: List[str],
+        metadatas: List[Dict]
+    ):
+        """
+        청크 묶음을 한 번의 collection.add로 추가
+        메모리 부족 시 청크 단위 추가로 전환
+        """
+        try:
+            self.collection.add(
+                ids=ids,
+                embeddings=embeddings,
+                documents=documents,
+                metadatas=metadatas
+            )
+        except MemoryError:
+            logger.warning(f"일괄 추가 중 메모리 부족, 청크 단위로 추가: {len(ids)}개")
+            for i in range(len(ids)):
+                self.collection.add(
+                    ids=[ids[i]],
+                    embeddings=[embeddings[i]],
+                    documents=[documents[i]],
+                    metadatas=[metadatas[i]]
+                )
+    
     def search(
         self,
         query_embedding: np.ndarray,
@@ -0,0 +1,51 @@
+"""
+upload_date 마이그레이션 스크립트 (ChromaDB 버전)
+ISO 8601 문자열로 저장된 upload_date를 epoch ms 정수로 변환 (1회 실행)
+"""
+
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rag.vector_store import VectorStore
+import config
+
+BATCH_SIZE = 1000
+
+
+def to_epoch_ms(value) -> int:
+    """ISO 8601 문자열 또는 빈 값을 epoch ms로 변환"""
+    if not value:
+        return 0
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() * 1000)
+
+
+def main():
+    """문자열 upload_date를 가진 청크의 메타데이터 갱신"""
+    vs = VectorStore.load(persist_dir=config.VECTOR_STORE_DIR)
+    total = vs.collection.count()
+    updated = 0
+
+    for offset in range(0, total, BATCH_SIZE):
+        batch = vs.collection.get(offset=offset, limit=BATCH_SIZE, include=["metadatas"])
+        ids, metadatas = [], []
+        for chunk_id, metadata in zip(batch["ids"], batch["metadatas"]):
+            if isinstance(metadata.get("upload_date"), str):
+                metadata["upload_date"] = to_epoch_ms(metadata["upload_date"])
+                ids.append(chunk_id)
+                metadatas.append(metadata)
+        if ids:
+            vs.collection.update(ids=ids, metadatas=metadatas)
+            updated += len(ids)
+
+    print(f"\nupload_date 변환 완료: {updated}/{total}개 청크")
+
+
+if __name__ == "__main__":
+    main()
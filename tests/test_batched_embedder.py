@@ -0,0 +1,158 @@
+"""
+동적 배칭(backend/batched_embedder.py) 테스트
+요청별 결과 전달, 요청 병합 조건, 예외 전달, SentenceTransformer 프록시 동작 확인
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트와 backend 폴더를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "backend"))
+
+from batched_embedder import DynamicBatcher, BatchedSentenceTransformer
+
+
+class RecordingFn:
+    """입력마다 값 * 10을 반환하고 호출별 입력을 기록하는 배치 함수"""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, items):
+        with self.lock:
+            self.calls.append(list(items))
+        return np.asarray(items) * 10
+
+
+class FakeSentenceTransformer:
+    """encode 호출을 기록하는 SentenceTransformer 대역 (텍스트 길이를 벡터로 반환)"""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, sentences, batch_size=32, show_progress_bar=None, convert_to_numpy=True, **kwargs):
+        self.calls.append(list(sentences) if not isinstance(sentences, str) else sentences)
+        if isinstance(sentences, str):
+            return np.array([len(sentences), 0], dtype=np.float32)
+        return np.array([[len(s), i] for i, s in enumerate(sentences)], dtype=np.float32)
+
+    def get_sentence_embedding_dimension(self):
+        return 2
+
+
+def test_result_routing():
+    """여러 요청을 한 번에 처리해도 각 Future는 자기 입력의 결과만 받음"""
+    print("\n1. 요청별 결과 전달")
+    fn = RecordingFn()
+    batcher = DynamicBatcher(fn, name="test-routing", max_batch=64, max_wait_ms=200, min_batch=1)
+
+    requests = [[1, 2, 3], [4], [5, 6], [7, 8, 9, 10]]
+    futures = [batcher.submit(items) for items in requests]
+
+    for items, future in zip(requests, futures):
+        assert list(future.result(timeout=5)) == [value * 10 for value in items]
+    assert len(fn.calls) == 1 and fn.calls[0] == [value for items in requests for value in items], fn.calls
+    print(f"   [OK] {len(requests)}개 요청 → 배치 함수 1회 호출, 결과 순서 유지")
+
+
+def test_concurrent_submit():
+    """여러 스레드에서 동시에 요청해도 결과가 섞이지 않음"""
+    print("\n2. 동시 요청")
+    fn = RecordingFn()
+    batcher = DynamicBatcher(fn, name="test-concurrent", max_batch=16, max_wait_ms=5, min_batch=1)
+    errors = []
+
+    def worker(base):
+        items = list(range(base, base + 5))
+        for _ in range(20):
+            result = batcher.submit(items).result(timeout=5)
+            if list(result) != [value * 10 for value in items]:
+                errors.append((base, list(result)))
+
+    threads = [threading.Thread(target=worker, args=(base * 100,)) for base in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors, errors[:3]
+    assert all(len(items) <= 16 + 4 for items in fn.calls)  # max_batch 도달 후에는 더 모으지 않음
+    print(f"   [OK] 8개 스레드 x 20회 요청, 배치 함수 {len(fn.calls)}회 호출")
+
+
+def test_min_batch():
+    """모인 입력 수가 min_batch보다 작으면 요청별로 따로 처리"""
+    print("\n3. 최소 병합 크기")
+    fn = RecordingFn()
+    batcher = DynamicBatcher(fn, name="test-min-batch", max_batch=64, max_wait_ms=200, min_batch=16)
+
+    futures = [batcher.submit([i]) for i in range(3)]
+    assert [list(future.result(timeout=5)) for future in futures] == [[0], [10], [20]]
+    assert fn.calls == [[0], [1], [2]], fn.calls
+    print("   [OK] 입력 3개 < min_batch 16 → 요청별 3회 호출")
+
+
+def test_exception_propagation():
+    """배치 함수 예외는 함께 처리된 모든 요청의 Future로 전달되고 워커는 계속 동작"""
+    print("\n4. 예외 전달")
+    fail = threading.Event()
+    fail.set()
+
+    def fn(items):
+        if fail.is_set():
+            raise RuntimeError("encode 실패")
+        return np.asarray(items)
+
+    batcher = DynamicBatcher(fn, name="test-error", max_batch=64, max_wait_ms=200, min_batch=1)
+    futures = [batcher.submit([1, 2]), batcher.submit([3])]
+    for future in futures:
+        try:
+            future.result(timeout=5)
+        except RuntimeError as e:
+            assert str(e) == "encode 실패"
+        else:
+            raise AssertionError("예외가 전달되지 않음")
+
+    fail.clear()
+    assert list(batcher.submit([4]).result(timeout=5)) == [4]
+    print("   [OK] 모든 요청에 예외 전달, 이후 요청 정상 처리")
+
+
+def test_sentence_transformer_proxy():
+    """BatchedSentenceTransformer: 단일 문장은 1차원, 리스트는 입력 순서의 2차원 결과"""
+    print("\n5. SentenceTransformer 프록시")
+    model = FakeSentenceTransformer()
+    proxy = BatchedSentenceTransformer(model)
+
+    single = proxy.encode("가나다")
+    assert single.shape == (2,) and single[0] == 3
+
+    texts = ["가", "가나", "가나다라"]
+    batch = proxy.encode(texts)
+    assert batch.shape == (3, 2) and list(batch[:, 0]) == [1, 2, 4]
+
+    # numpy 외 출력 요청은 배칭하지 않고 원본 모델로 바로 전달, 그 외 속성은 원본 모델로 위임
+    proxy.encode(texts, convert_to_numpy=False)
+    assert model.calls[-1] == texts
+    assert proxy.get_sentence_embedding_dimension() == 2
+    print("   [OK] 단일/리스트 입력 결과 형태, 원본 모델 위임")
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("동적 배칭 테스트 시작")
+    print("=" * 60)
+    test_result_routing()
+    test_concurrent_submit()
+    test_min_batch()
+    test_exception_propagation()
+    test_sentence_transformer_proxy()
+    print("\n" + "=" * 60)
+    print("테스트 완료!")
+    print("=" * 60 + "\n")
@@ -0,0 +1,197 @@
+"""
+extract.analyze_document_structure 테스트
+결합 정규식(finditer) 구현이 기존 줄 단위 패턴 매칭 구현과 같은 구조를 반환하는지 확인
+"""
+
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from extract import analyze_document_structure, extract_hwpx_with_structure, STRUCTURE_TYPES
+
+
+# 기존 구현의 패턴 (줄마다 strip 후 장 → 조 → 항 → 호 순서로 매칭)
+_CHAPTER_RE = re.compile(r'^제\s*(\d+)\s*장\s+(.+)$')
+_ARTICLE_RE = re.compile(r'^제\s*(\d+)\s*조\s*(?:\((.+?)\))?(.*)$')
+_PARAGRAPH_RE = re.compile(r'^([①②③④⑤⑥⑦⑧⑨⑩]|\d+\))\s*(.*)$')
+_SUBPARAGRAPH_RE = re.compile(r'^([가나다라마바사아자차카타파하])\.\s+(.*)$')
+_CIRCLED_NUMBERS = {'①': '1', '②': '2', '③': '3', '④': '4', '⑤': '5',
+                    '⑥': '6', '⑦': '7', '⑧': '8', '⑨': '9', '⑩': '10'}
+
+FIXTURE_TEXT = """제1장 총칙
+
+제1조 (목적) 이 규정은 직원의 급여에 관한 사항을 정함을 목적으로 한다.
+제2조(정의) 이 규정에서 사용하는 용어의 뜻은 다음과 같다.
+  ① "기본급"이란 직급별로 정한 월 급여를 말한다.
+② "수당"이란 기본급 외에 지급하는 급여를 말한다.
+가. 직책수당
+나.내용 없는 호(공백 없음, 호 아님)
+1) 숫자 항
+제3조 짧은 조
+
+제2장   급여 및 수당
+  제15조 (급여의 계산) ① 월 급여는 기본급과 수당을 합산한다.
+⑩ 열 번째 항
+다. 마지막 호
+제 16 조
+제3장
+본문 중간의 제4조 언급은 구조가 아님
+제17조 (급여의 지급일) 급여는 매월 25일에 지급한다."""
+
+
+def analyze_document_structure_reference(text_lines):
+    """기존 줄 단위 구현 (structure_map은 줄 번호 → 구조 정보 딕셔너리)"""
+    structure = {'chapters': [], 'articles': [], 'structure_map': {}}
+    current_chapter = None
+    current_article = None
+
+    for line_idx, line in enumerate(text_lines):
+        line = line.strip()
+        if not line:
+            continue
+
+        chapter_match = _CHAPTER_RE.match(line)
+        if chapter_match:
+            current_chapter = {
+                'number': chapter_match.group(1),
+                'title': chapter_match.group(2).strip(),
+                'line_idx': line_idx,
+                'articles': []
+            }
+            structure['chapters'].append(current_chapter)
+            structure['structure_map'][line_idx] = {
+                'type': 'chapter',
+                'number': current_chapter['number'],
+                'title': current_chapter['title']
+            }
+            continue
+
+        article_match = _ARTICLE_RE.match(line)
+        if article_match:
+            current_article = {
+                'number': article_match.group(1),
+                'title': article_match.group(2).strip() if article_match.group(2) else '',
+                'line_idx': line_idx,
+                'chapter_num': current_chapter['number'] if current_chapter else None,
+                'paragraphs': []
+            }
+            if current_chapter:
+                current_chapter['articles'].append(current_article)
+            structure['articles'].append(current_article)
+            structure['structure_map'][line_idx] = {
+                'type': 'article',
+                'number': current_article['number'],
+                'title': current_article['title'],
+                'chapter_num': current_article['chapter_num']
+            }
+            continue
+
+        para_match = _PARAGRAPH_RE.match(line)
+        if para_match:
+            para_num = para_match.group(1)
+            para_num_normalized = _CIRCLED_NUMBERS.get(para_num, para_num.rstrip(')'))
+            if current_article:
+                current_article['paragraphs'].append({'number': para_num_normalized, 'line_idx': line_idx})
+            structure['structure_map'][line_idx] = {
+                'type': 'paragraph',
+                'number': para_num_normalized,
+                'article_num': current_article['number'] if current_article else None,
+                'chapter_num': current_chapter['number'] if current_chapter else None
+            }
+            continue
+
+        subpara_match = _SUBPARAGRAPH_RE.match(line)
+        if subpara_match:
+            structure['structure_map'][line_idx] = {
+                'type': 'subparagraph',
+                'letter': subpara_match.group(1),
+                'article_num': current_article['number'] if current_article else None,
+                'chapter_num': current_chapter['number'] if current_chapter else None
+            }
+
+    return structure
+
+
+def structure_map_as_dict(structure_map):
+    """열 단위 structure_map을 기존 형식(줄 번호 → 구조 정보)으로 변환"""
+    result = {}
+    for i, line_idx in enumerate(structure_map['line_idx']):
+        kind = STRUCTURE_TYPES[structure_map['type'][i]]
+        if kind == 'chapter':
+            info = {'type': kind, 'number': structure_map['number'][i], 'title': structure_map['title'][i]}
+        elif kind == 'article':
+            info = {'type': kind, 'number': structure_map['number'][i], 'title': structure_map['title'][i],
+                    'chapter_num': structure_map['chapter_num'][i]}
+        elif kind == 'paragraph':
+            info = {'type': kind, 'number': structure_map['number'][i],
+                    'article_num': structure_map['article_num'][i], 'chapter_num': structure_map['chapter_num'][i]}
+        else:
+            info = {'type': kind, 'letter': structure_map['number'][i],
+                    'article_num': structure_map['article_num'][i], 'chapter_num': structure_map['chapter_num'][i]}
+        result[line_idx] = info
+    return result
+
+
+def assert_same_structure(text, name):
+    """전체 텍스트에 대해 기존 구현과 현재 구현 결과 비교 (문자열/줄 리스트 입력 모두)"""
+    expected = analyze_document_structure_reference(text.split('\n'))
+
+    for actual in (analyze_document_structure(text), analyze_document_structure(text.split('\n'))):
+        assert actual['chapters'] == expected['chapters'], f"{name}: 장 정보 불일치"
+        assert actual['articles'] == expected['articles'], f"{name}: 조 정보 불일치"
+        assert structure_map_as_dict(actual['structure_map']) == expected['structure_map'], \
+            f"{name}: structure_map 불일치"
+
+    print(f"   [OK] {name}: 장 {len(expected['chapters'])}개, 조 {len(expected['articles'])}개, "
+          f"구조 줄 {len(expected['structure_map'])}개 일치")
+
+
+def test_document_structure_fixture():
+    """고정 텍스트에서 기존 구현과 결과 비교"""
+    print("\n1. 고정 텍스트 비교")
+    assert_same_structure(FIXTURE_TEXT, "fixture")
+
+    structure = analyze_document_structure(FIXTURE_TEXT)
+    assert [ch['number'] for ch in structure['chapters']] == ['1', '2']
+    assert [art['number'] for art in structure['articles']] == ['1', '2', '3', '15', '16', '17']
+    assert [p['number'] for p in structure['articles'][1]['paragraphs']] == ['1', '2', '1']
+
+    # '제'가 없는 텍스트는 구조 검사를 생략 (소속 조가 없는 항/호 줄도 기록하지 않음)
+    empty = analyze_document_structure("① 항만 있는 문서\n가. 호")
+    assert not empty['chapters'] and not empty['articles'] and not empty['structure_map']['line_idx']
+    print("   [OK] '제'가 없는 텍스트는 빈 구조 반환")
+
+
+def test_document_structure_hwp_data():
+    """hwp_data의 HWPX 문서 전체 텍스트(save_results와 같은 결합 방식)에서 기존 구현과 결과 비교"""
+    print("\n2. 실제 문서 비교 (hwp_data)")
+
+    hwpx_files = sorted((project_root / "hwp_data").rglob("*.hwpx"))
+    if not hwpx_files:
+        print("   [SKIP] hwp_data에 HWPX 파일이 없습니다.")
+        return
+
+    for hwpx_path in hwpx_files:
+        # 이미지는 임시 폴더에 저장
+        with tempfile.TemporaryDirectory() as output_dir:
+            result = extract_hwpx_with_structure(str(hwpx_path), output_dir=output_dir)
+        text = '\n\n'.join(result["text_content"])
+        if '제' not in text:
+            continue
+        assert_same_structure(text, hwpx_path.name)
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("문서 구조 분석 테스트 시작")
+    print("=" * 60)
+    test_document_structure_fixture()
+    test_document_structure_hwp_data()
+    print("\n" + "=" * 60)
+    print("테스트 완료!")
+    print("=" * 60 + "\n")
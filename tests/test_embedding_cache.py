@@ -0,0 +1,158 @@
+"""
+임베딩 캐시(backend/embedding_cache.py) 테스트
+int8 직렬화 오차, 캐시 적중/미적중 순서, 유사 청크 임베딩 재사용 확인 (Redis 대신 메모리 클라이언트 사용)
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+# 프로젝트 루트와 backend 폴더를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "backend"))
+
+import embedding_cache
+from embedding_cache import CachedEmbedder, _quantize, _dequantize, last_hit_ratio
+
+
+class MemoryRedis:
+    """테스트용 메모리 Redis (mget / pipeline.set / execute만 지원)"""
+
+    def __init__(self):
+        self.data = {}
+        self._pending = []
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def pipeline(self, transaction=False):
+        return self
+
+    def set(self, key, value, ex=None):
+        self._pending.append((key, value))
+
+    def execute(self):
+        self.data.update(self._pending)
+        self._pending.clear()
+
+
+class FakeEmbedder:
+    """호출된 텍스트를 기록하고 텍스트별로 고정된 벡터를 반환하는 임베더"""
+
+    model_name = "test-model"
+    backend = "torch"
+    precision = "fp32"
+
+    def __init__(self, dim=8):
+        self.dim = dim
+        self.calls = []
+
+    def vector(self, text):
+        return np.random.default_rng(sum(text.encode("utf-8"))).standard_normal(self.dim).astype(np.float32)
+
+    def embed_texts(self, texts, batch_size=32, show_progress=True):
+        self.calls.append(list(texts))
+        return np.stack([self.vector(text) for text in texts])
+
+
+def make_docs(texts):
+    return [SimpleNamespace(page_content=text) for text in texts]
+
+
+def setup_cache(fuzzy=False):
+    """메모리 클라이언트로 캐시 초기화 (fuzzy=True면 메모리 MinHash LSH 사용)"""
+    embedding_cache._client = MemoryRedis()
+    embedding_cache._lsh_indexes.clear()
+    embedder = FakeEmbedder()
+    cached = CachedEmbedder(embedder)
+    name = f"{cached.provider}:{cached.model}"
+    if fuzzy:
+        from datasketch import MinHashLSH
+        embedding_cache._lsh_indexes[name] = MinHashLSH(threshold=0.8, num_perm=embedding_cache.FUZZY_NUM_PERM)
+    else:
+        embedding_cache._lsh_indexes[name] = None
+    return embedder, cached
+
+
+def test_quantize_round_trip():
+    """int8 직렬화 복원 오차는 벡터별 scale의 절반 이하"""
+    print("\n1. int8 직렬화 복원 오차")
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        vector = rng.standard_normal(1024).astype(np.float32) * rng.uniform(0.01, 10)
+        data = _quantize(vector)
+        assert len(data) == 4 + vector.size
+        restored = _dequantize(data)
+        scale = np.abs(vector).max() / 127
+        assert restored.dtype == np.float32
+        assert np.abs(restored - vector).max() <= scale / 2 + 1e-6
+
+    # 0 벡터는 scale 1로 저장되어 그대로 복원
+    assert not _dequantize(_quantize(np.zeros(16, dtype=np.float32))).any()
+    print("   [OK] 최대 오차 <= scale / 2, 0 벡터 복원")
+
+
+def test_hit_miss_ordering():
+    """캐시 적중/미적중이 섞여도 결과는 입력 순서, 미적중만 임베딩"""
+    print("\n2. 적중/미적중 혼합 순서")
+    embedder, cached = setup_cache()
+
+    cached.embed_documents(make_docs(["가", "다"]), show_progress=False)
+    embedder.calls.clear()
+
+    texts = ["가", "나", "다", "라", "가"]
+    result = cached.embed_documents(make_docs(texts), show_progress=False)
+
+    assert embedder.calls == [["나", "라"]], embedder.calls
+    assert result.shape == (len(texts), embedder.dim) and result.dtype == np.float32
+    for row, text in zip(result, texts):
+        scale = np.abs(embedder.vector(text)).max() / 127
+        assert np.abs(row - embedder.vector(text)).max() <= scale / 2 + 1e-6, text
+    assert last_hit_ratio() == 1 - 2 / 5
+
+    # 모두 적중하면 임베더를 호출하지 않음
+    embedder.calls.clear()
+    cached.embed_documents(make_docs(texts), show_progress=False)
+    assert embedder.calls == [] and last_hit_ratio() == 1
+    print("   [OK] 입력 순서 유지, 미적중 텍스트만 임베딩")
+
+
+def test_near_duplicate_reuse():
+    """한 단어만 바뀐 청크는 LSH로 찾은 기존 임베딩을 재사용"""
+    print("\n3. 유사 청크 임베딩 재사용")
+    embedder, cached = setup_cache(fuzzy=True)
+
+    words = [f"단어{i}" for i in range(200)]
+    original = " ".join(words)
+    edited = " ".join(words[:-1] + ["수정된단어"])
+    unrelated = " ".join(f"다른{i}" for i in range(200))
+
+    first = cached.embed_documents(make_docs([original]), show_progress=False)
+    assert embedder.calls == [[original]]
+    embedder.calls.clear()
+
+    result = cached.embed_documents(make_docs([edited, unrelated]), show_progress=False)
+    assert embedder.calls == [[unrelated]], embedder.calls
+    # 재사용 벡터는 캐시에서 복원한 값 (int8 직렬화를 거친 원본 청크 임베딩)
+    assert np.array_equal(result[0], _dequantize(_quantize(first[0])))
+
+    # 재사용한 임베딩은 수정된 청크의 해시로도 저장되어 다음에는 정확 일치로 적중
+    embedder.calls.clear()
+    cached.embed_documents(make_docs([edited]), show_progress=False)
+    assert embedder.calls == [] and last_hit_ratio() == 1
+    print("   [OK] 유사 청크는 재사용, 무관한 청크만 임베딩")
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("임베딩 캐시 테스트 시작")
+    print("=" * 60)
+    test_quantize_round_trip()
+    test_hit_miss_ordering()
+    test_near_duplicate_reuse()
+    print("\n" + "=" * 60)
+    print("테스트 완료!")
+    print("=" * 60 + "\n")
@@ -0,0 +1,122 @@
+"""
+RAGPipeline.add_document_from_extract 메타데이터 테스트
+사용자 메타데이터(upload_date 등)가 벡터 저장소에 저장되는 청크 메타데이터까지 전달되는지 확인
+(임베딩/요약/저장은 가짜 객체 사용, 청킹은 실제 StructureAwareChunker 사용)
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트와 backend 폴더를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "backend"))
+
+from rag.pipeline import RAGPipeline
+from rag.structure_chunker import StructureAwareChunker
+from utils import build_user_metadata
+
+DOCUMENT_TEXT = """제1장 총칙
+제1조 (목적) 이 규정은 직원의 급여에 관한 사항을 정함을 목적으로 한다.
+제2조 (정의) 이 규정에서 사용하는 용어의 뜻은 다음과 같다.
+① "기본급"이란 직급별로 정한 월 급여를 말한다."""
+
+
+class FakeLLM:
+    def summarize_document(self, text):
+        return "급여 규정 요약"
+
+
+class FakeEmbedder:
+    def embed_documents(self, documents, show_progress=True):
+        return np.zeros((len(documents), 4), dtype=np.float32)
+
+
+class RecordingVectorStore:
+    """add_documents로 받은 청크를 기록하는 벡터 저장소"""
+
+    def __init__(self):
+        self.documents = []
+
+    def add_documents(self, documents, embeddings):
+        assert len(documents) == len(embeddings)
+        self.documents.extend(documents)
+
+    def save(self):
+        pass
+
+
+def make_pipeline():
+    """모델 로드 없이 파이프라인 구성"""
+    pipeline = RAGPipeline.__new__(RAGPipeline)
+    pipeline.use_structure_chunking = True
+    pipeline.chunker = StructureAwareChunker()
+    pipeline.embedder = FakeEmbedder()
+    pipeline.llm = FakeLLM()
+    pipeline.vector_store = RecordingVectorStore()
+    return pipeline
+
+
+def make_extracted_dir(root):
+    """extract.py 결과와 같은 형식의 추출 폴더 생성"""
+    extracted_dir = Path(root) / "extracted_급여규정"
+    extracted_dir.mkdir()
+    (extracted_dir / "급여규정_전체텍스트.txt").write_text(DOCUMENT_TEXT, encoding="utf-8")
+    (extracted_dir / "급여규정_구조.json").write_text(json.dumps({
+        "file_type": "hwpx",
+        "document_structure": {"total_chapters": 1, "total_articles": 2}
+    }), encoding="utf-8")
+    return extracted_dir
+
+
+def test_user_metadata_reaches_chunks():
+    """user_metadata는 모든 청크 메타데이터와 반환값에 반영"""
+    print("\n1. 사용자 메타데이터 전달")
+    pipeline = make_pipeline()
+    user_metadata = build_user_metadata(user_id="u1", dept_id="hr", project_id="p1", category="규정")
+
+    with tempfile.TemporaryDirectory() as root:
+        result = pipeline.add_document_from_extract(
+            extracted_dir=make_extracted_dir(root),
+            user_metadata=user_metadata
+        )
+
+    chunks = pipeline.vector_store.documents
+    assert chunks and result['chunks_added'] == len(chunks)
+    for chunk in chunks:
+        for key, value in user_metadata.items():
+            assert chunk.metadata[key] == value, key
+        assert isinstance(chunk.metadata['upload_date'], int) and chunk.metadata['upload_date'] > 0
+        assert chunk.metadata['file_type'] == 'hwpx' and chunk.metadata['doc_id'] == 'doc_급여규정'
+
+    assert result['doc_id'] == 'doc_급여규정' and result['summary'] == "급여 규정 요약"
+    assert result['metadata']['dept_id'] == 'hr'
+    print(f"   [OK] 청크 {len(chunks)}개 모두 user_metadata 포함 (upload_date={user_metadata['upload_date']})")
+
+
+def test_without_user_metadata():
+    """user_metadata가 없으면 기본값 유지 (기존 호출 방식 호환)"""
+    print("\n2. 사용자 메타데이터 없음")
+    pipeline = make_pipeline()
+
+    with tempfile.TemporaryDirectory() as root:
+        pipeline.add_document_from_extract(make_extracted_dir(root))
+
+    for chunk in pipeline.vector_store.documents:
+        assert chunk.metadata['upload_date'] == 0 and chunk.metadata['dept_id'] == ''
+    print("   [OK] 기본 메타데이터 유지")
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("파이프라인 메타데이터 테스트 시작")
+    print("=" * 60)
+    test_user_metadata_reaches_chunks()
+    test_without_user_metadata()
+    print("\n" + "=" * 60)
+    print("테스트 완료!")
+    print("=" * 60 + "\n")